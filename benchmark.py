@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the slide builders and helpers.
+
+Usage: ./benchmark.py [--rounds N] [--only NAME,...] [--save RESULTS]
+                      [--compare RESULTS] [--threshold FRACTION]
+
+Each benchmark is timed separately for constructing its figure, and for
+rendering it to PDF and with Agg. Results may be saved and compared against an
+earlier run, in which case any benchmark that has become slower by more than
+the threshold is reported and the script fails.
+
+The timeline is benchmarked against a small git repository created in a
+temporary directory, so no Matplotlib checkout is needed.
+"""
+
+import argparse
+import io
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+import time
+
+
+#: The phases that are timed for each benchmark, and their labels.
+PHASES = {'construct': 'Construct', 'pdf': 'PDF', 'agg': 'Agg'}
+
+#: Release tags and their dates, for the fixture repository.
+FIXTURE_TAGS = [
+    ('v3.5.0', '2021-11-16'), ('v3.5.1', '2021-12-11'), ('v3.5.2', '2022-05-03'),
+    ('v3.5.3', '2022-08-10'), ('v3.6.0rc1', '2022-08-19'), ('v3.6.0', '2022-09-15'),
+    ('v3.6.1', '2022-10-08'), ('v3.6.2', '2022-11-02'), ('v3.6.3', '2023-01-11'),
+    ('v3.7.0', '2023-02-13'), ('v3.7.1', '2023-03-04'), ('v3.7.2', '2023-07-05'),
+    ('v3.8.0b1', '2023-08-11'), ('v3.8.0', '2023-09-14'), ('v3.8.1', '2023-10-31'),
+    ('v3.8.2', '2023-11-17'), ('v3.8.3', '2024-02-14'), ('v3.8.4', '2024-04-03'),
+    ('v3.9.0', '2024-05-15'), ('v3.9.1', '2024-07-04'),
+]
+
+
+def create_fixture_repository(path):
+    """
+    Create a git repository at *path* with release tags for the timeline.
+    """
+    env = {
+        **os.environ,
+        'GIT_AUTHOR_NAME': 'benchmark', 'GIT_AUTHOR_EMAIL': 'benchmark@example.com',
+        'GIT_COMMITTER_NAME': 'benchmark',
+        'GIT_COMMITTER_EMAIL': 'benchmark@example.com',
+    }
+
+    def git(*args, date=None):
+        if date is not None:
+            env['GIT_COMMITTER_DATE'] = f'{date}T12:00:00'
+        subprocess.run(['git', *args], cwd=path, env=env, check=True,
+                       capture_output=True)
+
+    git('init')
+    git('commit', '--allow-empty', '-m', 'Initial commit',
+        date=FIXTURE_TAGS[0][1])
+    for tag, date in FIXTURE_TAGS:
+        git('tag', '-a', tag, '-m', f'Release {tag}', date=date)
+
+
+def get_benchmarks(mpl_path):
+    """
+    Return the benchmarks to run.
+
+    Parameters
+    ----------
+    mpl_path : str or pathlib.Path
+        Path to a git repository with release tags, for the timeline.
+
+    Returns
+    -------
+    dict
+        Mapping of benchmark name to a function that creates a figure. The
+        construction phase is timed for the whole function, except for helpers,
+        where the function returns a (setup, run) pair, and only *run* (which
+        is passed the result of *setup*) is timed.
+    """
+    import end
+    import feature38
+    import feature39
+    import feature310
+    import mplslide
+    import timeline
+    import title
+
+    def helper(run):
+        return mplslide.new_slide, run
+
+    return {
+        'feature38.ecdf': feature38.ecdf,
+        'feature38.mathtext': feature38.mathtext,
+        'feature39.violin_sides': feature39.violin_sides,
+        'feature310.multivariate_colormaps': feature310.multivariate_colormaps,
+        'title.slides': title.slides,
+        'timeline.slides': lambda: timeline.slides(mpl_path),
+        'end.slides': end.slides,
+        'mplslide.add_qrcode': lambda: helper(
+            lambda fig: mplslide.add_qrcode(
+                fig, 'https://github.com/QuLogic/scipy2024-mpl-update',
+                [0.0, 0.0, 0.6, 0.6])),
+        'title.create_icon_axes': lambda: helper(
+            lambda fig: title.create_icon_axes(fig, mplslide.CORNER_LOGO_POSITION,
+                                               0.3, 0.3, 0.3, [5])),
+        'title.create_text_axes': lambda: helper(
+            lambda fig: title.create_text_axes(fig, 110)),
+    }
+
+
+def clear_caches():
+    """
+    Clear the in-process caches of slide data, so that each round starts cold.
+
+    Otherwise, only the first round would encode QR codes, measure text, or
+    compute fields, and the minimum time would never show a regression in
+    them.
+    """
+    import feature310
+    import mplslide
+
+    # These are wrapped by `mplslide.prefetchable`, around a `functools` cache.
+    for func in [mplslide._qrcode_path, feature310.mandelbrot_field,
+                 feature310.sinusoid_images]:
+        func.__wrapped__.cache_clear()
+    mplslide._text_extents.clear()
+
+
+def run_benchmark(func, rounds):
+    """
+    Time each phase of a benchmark, with caches cleared before each round.
+
+    Returns
+    -------
+    dict
+        Mapping of phase name to the list of times, in seconds, of each round.
+    """
+    times = {phase: [] for phase in PHASES}
+    for _ in range(rounds):
+        clear_caches()
+        start = time.perf_counter()
+        result = func()
+        if isinstance(result, tuple):
+            setup, run = result
+            fig = setup()
+            start = time.perf_counter()
+            run(fig)
+        else:
+            fig = result
+        times['construct'].append(time.perf_counter() - start)
+
+        for phase, fmt in [('pdf', 'pdf'), ('agg', 'png')]:
+            start = time.perf_counter()
+            fig.savefig(io.BytesIO(), format=fmt)
+            times[phase].append(time.perf_counter() - start)
+    return times
+
+
+def summarize(times):
+    """Return the minimum and median of each phase of *times*."""
+    summary = {}
+    for phase, values in times.items():
+        values = sorted(values)
+        summary[phase] = {'min': values[0], 'median': values[len(values) // 2]}
+    return summary
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare *results* against *baseline*.
+
+    Returns
+    -------
+    list of str
+        A description of each phase of each benchmark whose minimum time has
+        grown by more than *threshold* (as a fraction).
+    """
+    regressions = []
+    for name, phases in results.items():
+        if name not in baseline:
+            continue
+        for phase, summary in phases.items():
+            old = baseline[name].get(phase, {}).get('min')
+            new = summary['min']
+            if old and new > old * (1 + threshold):
+                regressions.append(f'{name} [{phase}]: {old * 1000:.1f} ms -> '
+                                   f'{new * 1000:.1f} ms ({new / old - 1:+.0%})')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the slide builders and helpers.')
+    parser.add_argument('--rounds', type=int, default=5,
+                        help='Number of times to run each benchmark.')
+    parser.add_argument('--only', type=lambda value: value.split(','),
+                        metavar='NAME,...',
+                        help='Comma-separated benchmarks to run, instead of all.')
+    parser.add_argument('--save', metavar='RESULTS',
+                        help='Write the results to this JSON file.')
+    parser.add_argument('--compare', metavar='RESULTS',
+                        help='Compare the results against this JSON file.')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Fraction by which a benchmark may slow down '
+                             'before it is considered a regression.')
+    args = parser.parse_args()
+
+    from mplslide import check_requirements
+    check_requirements()
+
+    with tempfile.TemporaryDirectory() as mpl_path:
+        create_fixture_repository(pathlib.Path(mpl_path))
+        benchmarks = get_benchmarks(mpl_path)
+        if args.only is not None:
+            unknown = set(args.only) - set(benchmarks)
+            if unknown:
+                parser.error(f'unknown benchmarks: {", ".join(sorted(unknown))}')
+            benchmarks = {name: func for name, func in benchmarks.items()
+                          if name in args.only}
+
+        width = max(len(name) for name in benchmarks)
+        print(f'{"Benchmark":<{width}}' +
+              ''.join(f'{label:>12}' for label in PHASES.values()))
+        results = {}
+        for name, func in benchmarks.items():
+            results[name] = summarize(run_benchmark(func, args.rounds))
+            print(f'{name:<{width}}' +
+                  ''.join(f'{results[name][phase]["min"] * 1000:9.1f} ms'
+                          for phase in PHASES))
+
+    if args.save is not None:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print('\nPerformance regressions:')
+            for regression in regressions:
+                print(f'  {regression}')
+            sys.exit(1)
+        print('\nNo performance regressions.')
+
+
+if __name__ == '__main__':
+    main()
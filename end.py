@@ -2,7 +2,22 @@
 End slide.
 """
 
-from mplslide import FONT, new_slide, slide_heading, add_qrcode
+from mplslide import (FONT, new_slide, slide_heading, add_qrcode, fit_width,
+                      prefetch_qrcode)
+
+
+#: The URL of this presentation.
+SLIDES_URL = 'https://github.com/QuLogic/scipy2024-mpl-update'
+#: The URL of the Matplotlib release notes.
+RELEASE_NOTES_URL = 'https://matplotlib.org/stable/users/release_notes'
+
+
+def prefetch():
+    """
+    Start encoding the QR codes for this section.
+    """
+    prefetch_qrcode(SLIDES_URL)
+    prefetch_qrcode(RELEASE_NOTES_URL)
 
 
 def slides():
@@ -16,20 +31,25 @@ def slides():
     props = dict(fontproperties=FONT, fontsize=56, alpha=0.7,
                  horizontalalignment='center')
 
-    fig.text(0.5, 0.7, 'This entire presentation was made in Matplotlib:',
-             **props)
-
-    t = fig.text(0.5, 0.6, '\nhttps://github.com/QuLogic/scipy2024-mpl-update',
-                 **props)
-    t.set_url('https://github.com/QuLogic/scipy2024-mpl-update')
-
-    fig.text(0.15, 0.3, 'Slides', rotation=90, verticalalignment='center', **props)
-    add_qrcode(fig, 'https://github.com/QuLogic/scipy2024-mpl-update',
-               [0.0, 0.0, 0.6, 0.6])
-
-    fig.text(0.55, 0.3, 'Release Notes', rotation=90, verticalalignment='center',
-             **props)
-    add_qrcode(fig, 'https://matplotlib.org/stable/users/release_notes',
-               [0.4, 0.0, 0.6, 0.6])
+    intro = fig.text(0.5, 0.7,
+                     'This entire presentation was made in Matplotlib:', **props)
+
+    t = fig.text(0.5, 0.6, f'\n{SLIDES_URL}', **props)
+    t.set_url(SLIDES_URL)
+    fit_width(intro, t, left=0.05, right=0.95)
+
+    # The QR codes are centred on each half of the slide, and shrunk (with
+    # their labels) if they would overlap on a narrow slide. Each label is in
+    # the quiet zone of its code, 1/18 of its width from the left edge.
+    width, height = fig.get_size_inches()
+    scale = min(1, 0.4 * width / (0.6 * height))
+    size = 0.6 * scale * height / width, 0.6 * scale
+    props['fontsize'] *= scale
+    for x, label, url in [(0.3, 'Slides', SLIDES_URL),
+                          (0.7, 'Release Notes', RELEASE_NOTES_URL)]:
+        left = x - size[0] / 2
+        fig.text(left + size[0] / 18, 0.3, label, rotation=90,
+                 verticalalignment='center', **props)
+        add_qrcode(fig, url, [left, 0.3 - size[1] / 2, *size])
 
     return fig
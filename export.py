@@ -0,0 +1,305 @@
+"""
+Export of slides to image formats and HTML, alongside the PDF.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import html
+import io
+import json
+import pathlib
+
+import numpy as np
+
+
+#: Slides whose SVG would be larger than this many bytes are written to HTML as
+#: PNG instead.
+HTML_SVG_LIMIT = 2 * 2**20
+
+
+class SlideExporter:
+    """
+    Write each slide to PNG and/or SVG files.
+
+    Each figure is only drawn once for all PNG resolutions; it is rendered at
+    the highest one, and smaller images are resampled from that. Drawing must
+    happen in the calling thread, but encoding, resampling, and writing of the
+    files are done in a pool of threads (which mostly release the GIL), so
+    that formats are written concurrently with each other and with the next
+    slide being built.
+
+    This should be used as a context manager, which waits for all files to be
+    written on exit. Only the settings are pickled, so it may be passed to
+    worker processes before being entered.
+
+    Parameters
+    ----------
+    png_dpis : list of float, optional
+        The resolutions at which to write PNG files.
+    svg : bool, default: False
+        Whether to write SVG files.
+    html : bool, default: False
+        Whether to write the files for an HTML deck; see `write_html_index`.
+    """
+
+    def __init__(self, png_dpis=(), svg=False, html=False):
+        self.png_dpis = sorted(set(png_dpis), reverse=True)
+        self.svg = svg
+        self.html = html
+        self._executor = None
+        self._futures = []
+
+    def __bool__(self):
+        return bool(self.png_dpis) or self.svg or self.html
+
+    def __repr__(self):
+        return (f'SlideExporter(png_dpis={self.png_dpis!r}, svg={self.svg!r}, '
+                f'html={self.html!r})')
+
+    def __getstate__(self):
+        return {'png_dpis': self.png_dpis, 'svg': self.svg, 'html': self.html,
+                '_executor': None, '_futures': []}
+
+    def __enter__(self):
+        self._executor = ThreadPoolExecutor()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._executor.shutdown(wait=True)
+        self._executor = None
+        futures, self._futures = self._futures, []
+        if exc_type is None:
+            for future in futures:
+                future.result()  # Raise any errors from writing.
+
+    def save(self, fig, stem):
+        """
+        Export a slide.
+
+        Parameters
+        ----------
+        fig : matplotlib.figure.Figure
+            The slide figure. It may be modified or freed once this returns.
+        stem : pathlib.Path
+            The path and base name of the files to write; PNG files are named
+            ``{stem}-{dpi}dpi.png``, SVG files ``{stem}.svg``, and HTML slides
+            ``{stem}-html.svg`` or ``{stem}-html.png``, with their details in
+            ``{stem}-html.json``.
+
+        Returns
+        -------
+        list of pathlib.Path
+            The files that will be written.
+        """
+        paths = []
+        if self.png_dpis:
+            dpi = self.png_dpis[0]
+            buf = io.BytesIO()
+            fig.savefig(buf, format='rgba', dpi=dpi)
+            width = int(fig.get_figwidth() * dpi)
+            rgba = np.frombuffer(buf.getbuffer(), np.uint8).reshape((-1, width, 4))
+            for dpi in self.png_dpis:
+                path = stem.with_name(f'{stem.name}-{dpi:g}dpi.png')
+                size = (int(fig.get_figwidth() * dpi), int(fig.get_figheight() * dpi))
+                self._futures.append(
+                    self._executor.submit(_write_png, rgba, size, path))
+                paths.append(path)
+        if self.svg:
+            buf = io.BytesIO()
+            fig.savefig(buf, format='svg')
+            path = stem.with_suffix('.svg')
+            self._futures.append(
+                self._executor.submit(path.write_bytes, buf.getvalue()))
+            paths.append(path)
+        if self.html:
+            paths.extend(self._save_html(fig, stem))
+        return paths
+
+    def _save_html(self, fig, stem):
+        """
+        Export a slide for the HTML deck, without its shared corner logo.
+
+        The slide is written as SVG, in which hyperlinks are kept as anchors,
+        unless that is too large, in which case it is written as PNG, and the
+        position of its hyperlinks are recorded.
+        """
+        from slidepdf import SharedFigureArtist
+
+        logos = [artist for artist in fig.artists
+                 if isinstance(artist, SharedFigureArtist) and artist.get_visible()]
+        for logo in logos:
+            logo.set_visible(False)
+        try:
+            info = {'logo': bool(logos), 'links': []}
+            buf = io.BytesIO()
+            # Leave out the date, so unchanged slides are identical between builds.
+            fig.savefig(buf, format='svg', metadata={'Date': None})
+            if buf.tell() <= HTML_SVG_LIMIT:
+                path = stem.with_name(f'{stem.name}-html.svg')
+            else:
+                buf = io.BytesIO()
+                fig.savefig(buf, format='png')
+                path = stem.with_name(f'{stem.name}-html.png')
+                info['links'] = _link_boxes(fig)
+        finally:
+            for logo in logos:
+                logo.set_visible(True)
+        info_path = stem.with_name(f'{stem.name}-html.json')
+        self._futures.append(self._executor.submit(path.write_bytes, buf.getvalue()))
+        self._futures.append(self._executor.submit(info_path.write_text,
+                                                   json.dumps(info)))
+        return [path, info_path]
+
+
+def _link_boxes(fig):
+    """
+    Return the hyperlinks of all artists in *fig* and where they are drawn.
+
+    The figure must have just been drawn at its own DPI. Boxes are given as left,
+    top, width, and height, in fractions of the slide, as used in CSS.
+    """
+    width, height = fig.bbox.width, fig.bbox.height
+    links = []
+    for artist in fig.findobj(lambda artist: artist.get_url() is not None):
+        bbox = artist.get_window_extent()
+        if not bbox.width or not bbox.height:
+            continue
+        links.append({'url': artist.get_url(),
+                      'box': [bbox.x0 / width, 1 - bbox.y1 / height,
+                              bbox.width / width, bbox.height / height]})
+    return links
+
+
+def remove_html_slides(outdir):
+    """
+    Remove the slides of an earlier HTML export from *outdir*.
+
+    `write_html_index` includes every slide in the directory, so this should
+    be called before exporting, in case the deck has since become shorter.
+    """
+    for path in pathlib.Path(outdir).glob('[0-9][0-9][0-9]-html.*'):
+        path.unlink()
+
+
+def write_html_index(outdir, logo, title):
+    """
+    Write an HTML deck of the slides exported into *outdir*.
+
+    The page needs no external resources. The first slide is inlined, so it
+    is shown immediately, while the others are only loaded when scrolled near,
+    along with the one after them. SVG slides are inlined into the page, so
+    that their hyperlinks work. The corner logo is written once, and laid over
+    each slide that has it.
+
+    Parameters
+    ----------
+    outdir : pathlib.Path
+        The directory containing the slides exported with ``html=True``, and
+        in which to write ``index.html`` and ``logo.svg``.
+    logo : matplotlib.figure.Figure
+        The corner logo, as drawn over slides.
+    title : str
+        The title of the page.
+    """
+    outdir = pathlib.Path(outdir)
+    logo.savefig(outdir / 'logo.svg', format='svg', transparent=True,
+                 metadata={'Date': None})
+    width, height = logo.get_size_inches()
+
+    slides = []
+    for info_path in sorted(outdir.glob('[0-9][0-9][0-9]-html.json')):
+        info = json.loads(info_path.read_text())
+        stem = info_path.name.removesuffix('.json')
+        src = next(path.name for path in outdir.glob(f'{stem}.*')
+                   if path.suffix in ('.svg', '.png'))
+        parts = [f'<section class="slide" data-src="{html.escape(src)}">']
+        if not slides and src.endswith('.svg'):
+            svg = (outdir / src).read_text()
+            parts.append(svg[svg.index('<svg'):])
+        elif src.endswith('.png'):
+            loading = 'eager' if not slides else 'lazy'
+            parts.append(f'<img src="{html.escape(src)}" alt="" loading="{loading}">')
+        for link in info['links']:
+            left, top, box_width, box_height = (f'{value:.3%}' for value in link['box'])
+            parts.append(f'<a class="link" href="{html.escape(link["url"])}" '
+                         f'style="left:{left};top:{top};width:{box_width};'
+                         f'height:{box_height}"></a>')
+        if info['logo']:
+            parts.append('<img class="logo" src="logo.svg" alt="">')
+        parts.append('</section>')
+        slides.append(''.join(parts))
+
+    (outdir / 'index.html').write_text(_HTML_TEMPLATE.format(
+        title=html.escape(title), aspect=f'{width:g} / {height:g}',
+        slides='\n'.join(slides)))
+
+
+_HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<style>
+body {{ margin: 0; background: #333; }}
+.slide {{ position: relative; max-width: 1280px; margin: 2em auto;
+          aspect-ratio: {aspect}; background: white; overflow: hidden; }}
+.slide > svg, .slide > img, .slide > object {{ position: absolute; inset: 0;
+                                               width: 100%; height: 100%; }}
+.slide > .logo {{ pointer-events: none; }}
+.slide > .link {{ position: absolute; }}
+</style>
+</head>
+<body>
+{slides}
+<script>
+const slides = [...document.querySelectorAll('.slide')];
+
+function load(slide) {{
+  if (!slide || slide.dataset.loaded) return;
+  slide.dataset.loaded = 'true';
+  const src = slide.dataset.src;
+  if (!src.endsWith('.svg')) {{
+    // PNG slides are already in the page, and only need to start loading.
+    slide.querySelector('img:not(.logo)').loading = 'eager';
+    return;
+  }}
+  if (slide.querySelector('svg')) return;
+  fetch(src)
+    .then((response) => response.ok ? response.text() : Promise.reject())
+    .then((text) => {{
+      const doc = new DOMParser().parseFromString(text, 'image/svg+xml');
+      slide.prepend(document.importNode(doc.documentElement, true));
+    }})
+    .catch(() => {{
+      // E.g., when opened from a file, fall back to embedding the SVG.
+      const object = document.createElement('object');
+      object.type = 'image/svg+xml';
+      object.data = src;
+      slide.prepend(object);
+    }});
+}}
+
+const observer = new IntersectionObserver((entries) => {{
+  for (const entry of entries) {{
+    if (entry.isIntersecting) {{
+      const index = slides.indexOf(entry.target);
+      load(slides[index]);
+      load(slides[index + 1]);  // Prefetch the next slide.
+    }}
+  }}
+}}, {{ rootMargin: '50%' }});
+slides.forEach((slide) => observer.observe(slide));
+</script>
+</body>
+</html>
+"""
+
+
+def _write_png(rgba, size, path):
+    """Write the *rgba* image to *path*, resampled to *size* if needed."""
+    from PIL import Image
+
+    image = Image.fromarray(rgba, 'RGBA')
+    if image.size != size:
+        image = image.resize(size, Image.Resampling.LANCZOS)
+    image.save(path, format='png')
@@ -2,54 +2,48 @@
 Feature highlights for Matplotlib 3.10.0.
 """
 
-from functools import partial
+import functools
 
 import numpy as np
 import matplotlib as mpl
 
+from fractal import mandelbrot
 from mplslide import (
-    BULLET, FONT, new_slide, slide_heading, add_qrcode, annotate_pr_author)
+    BULLET, Bullet, Code, new_slide, slide_heading, add_bullets, add_image,
+    add_mesh, add_qrcode, annotate_pr_author, prefetch_qrcode, prefetchable)
 
-CODE = dict(fontfamily='monospace', fontsize=32, verticalalignment='top',
-            alpha=0.7)
+#: The resolution of the Mandelbrot set, in rows and columns.
+MANDELBROT_SHAPE = (200, 200)
+#: The resolution of the multivariate sinusoid images, in rows and columns.
+SINUSOID_SHAPE = (200, 200)
+#: The URL of the QR code on the sprint slide.
+CALENDAR_URL = 'https://scientific-python.org/calendars/'
 
 
-def bullet_level1(fig, y, text):
+@prefetchable
+@functools.cache
+def mandelbrot_field(shape):
     """
-    Create a level 1 list item.
-
-    Parameters
-    ----------
-    fig : matplotlib.figure.Figure
-        A slide figure.
-    y : float
-        The vertical position for the list item, in 0-1 figure space.
-    text : str
-        The text to place in the list item.
+    Compute the Mandelbrot field for the slide, only once for all variants.
     """
-    return fig.text(0.05, y, text,
-                    fontproperties=FONT, fontsize=48, alpha=0.7,
-                    verticalalignment='top')
+    # Points only need to escape far enough to saturate the colormap.
+    return mandelbrot((-1.5, 0.5), (-1, 1), shape, 7, radius=1e3)
 
 
-def bullet_level2(fig, y, text, **kwargs):
+@prefetchable
+@functools.cache
+def sinusoid_images(shape):
     """
-    Create a level 2 list item.
-
-    This is roughly the same as level 1, but not bolded, and indented more.
-
-    Parameters
-    ----------
-    fig : matplotlib.figure.Figure
-        A slide figure.
-    y : float
-        The vertical position for the list item, in 0-1 figure space.
-    text : str
-        The text to place in the list item.
+    Compute the three sinusoid images for the slide, only once for all variants.
     """
-    return fig.text(0.1, y, text,
-                    **{'fontproperties': FONT, 'fontsize': 48, 'fontweight': 'normal',
-                       'alpha': 0.7, 'verticalalignment': 'top', **kwargs})
+    im_A = np.arange(shape[1])[np.newaxis, :]*np.ones(shape)
+    im_B = np.arange(shape[0])[:, np.newaxis]*np.ones(shape)
+    im_C = 0.9*im_A + 0.9*im_B
+
+    im_A = np.sin(im_A**0.5)**2
+    im_B = np.sin(im_B**0.5)**2
+    im_C = np.sin(im_C**0.5)**2
+    return im_A, im_B, im_C
 
 
 def multivariate_colormaps():
@@ -60,24 +54,17 @@ def multivariate_colormaps():
 
     slide_heading(fig, '3.10: Upcoming features')
 
-    level1 = partial(bullet_level1, fig)
-
-    level1(0.8, f'{BULLET} Multivariate colormapping')
+    add_bullets(fig, [f'{BULLET} Multivariate colormapping'])
 
     left, right = fig.subplots(1, 2)
     fig.subplots_adjust(top=0.7)
 
-    im_A = np.arange(200)[np.newaxis, :]*np.ones((200, 200))
-    im_B = np.arange(200)[:, np.newaxis]*np.ones((200, 200))
-    im_C = 0.9*im_A + 0.9*im_B
-
-    im_A = np.sin(im_A**0.5)**2
-    im_B = np.sin(im_B**0.5)**2
-    im_C = np.sin(im_C**0.5)**2
+    im_A, im_B, im_C = sinusoid_images(SINUSOID_SHAPE)
 
     cmaps = mpl.multivar_colormaps['3VarAddA']
 
-    cm = left.imshow((im_A, im_B, im_C), cmap=cmaps, vmin=(0, 0, 0), vmax=(1, 1, 1))
+    cm = add_image(left, (im_A, im_B, im_C), multivariate=True, cmap=cmaps,
+                   vmin=(0, 0, 0), vmax=(1, 1, 1))
     cbar_A, cbar_B, cbar_C = fig.colorbars(cm)
     cbar_A.set_label('A', fontsize=24)
     cbar_B.set_label('B', fontsize=24)
@@ -85,15 +72,10 @@ def multivariate_colormaps():
     for cb in (cbar_A, cbar_B, cbar_C):
         cb.set_ticks([])
 
-    x = np.linspace(-1.5, 0.5, 200)
-    y = np.linspace(-1, 1, 200)
-    xx, yy = np.meshgrid(x, y)
-    c = xx+1j*yy
-    z = c
-    for i in range(7):
-        z = z**2+c
+    x, y, z, _ = mandelbrot_field(MANDELBROT_SHAPE)
 
-    cm = right.pcolormesh(xx, yy, (z.imag, z.real), cmap='BiCone', vmin=-1, vmax=1)
+    cm = add_mesh(right, x, y, (z.imag, z.real), multivariate=True,
+                  cmap='BiCone', vmin=-1, vmax=1)
     right.set_xlabel('Re{$c$}', fontsize=24)
     right.set_ylabel('Im{$c$}', fontsize=24)
     right.set_title('Mandelbrot $z_{7}$ $z_i = z_{i-1}^2+c$', fontsize=24)
@@ -118,29 +100,33 @@ def misc():
 
     slide_heading(fig, 'Sprint topics')
 
-    level1 = partial(bullet_level1, fig)
-    level2 = partial(bullet_level2, fig)
+    add_bullets(fig, [
+        f'{BULLET} GSoD for example categorization (Eva Sibinga)',
+        Bullet(f'{BULLET} Tagging examples with sphinx-tags (by @melissawm)',
+               Code('.. tags:: animation, component: axes'),
+               'Come to our Sprint!'),
+        Bullet(f'{BULLET} Your Contribution?',
+               Bullet(f'{BULLET} New Contributors Meeting\n'
+                      '    (first Tuesday of month)',
+                      url=CALENDAR_URL)),
+    ])
+    add_qrcode(fig, CALENDAR_URL, [0.6, 0.1, 0.4, 0.4])
 
-    level1(0.8, f'{BULLET} GSoD for example categorization (Eva Sibinga)')
-    level1(0.7, f'{BULLET} Tagging examples with sphinx-tags (by @melissawm)')
-    level2(0.7, '\n\n.. tags:: animation, component: axes', **CODE)
-    level2(0.7, '\n\n\nCome to our Sprint!')
+    return fig
 
-    level1(0.4, f'{BULLET} Your Contribution?')
-    t = level2(
-        0.4,
-        f'\n{BULLET} New Contributors Meeting\n    (first Tuesday of month)')
-    t.set_url('https://scientific-python.org/calendars/')
-    add_qrcode(fig, 'https://scientific-python.org/calendars/', [0.6, 0.1, 0.4, 0.4])
 
-    return fig
+def prefetch():
+    """
+    Start preparing the data for this section.
+    """
+    mandelbrot_field.prefetch(MANDELBROT_SHAPE)
+    sinusoid_images.prefetch(SINUSOID_SHAPE)
+    prefetch_qrcode(CALENDAR_URL)
 
 
 def slides():
     """
-    Return slides for this section.
+    Yield slides for this section.
     """
-    return (
-        multivariate_colormaps(),
-        misc(),
-    )
+    yield multivariate_colormaps()
+    yield misc()
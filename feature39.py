@@ -4,48 +4,29 @@ Feature highlights for Matplotlib 3.9.0.
 
 import numpy as np
 
-from mplslide import FONT, new_slide, slide_heading, annotate_pr_author
+from mplslide import (
+    CODE, new_slide, slide_heading, bullet_level2, annotate_pr_author, dataset,
+    fit_width, get_dataset)
 
-CODE = dict(fontfamily='monospace', fontsize=32, verticalalignment='top',
-            alpha=0.7)
 
+@dataset('fruit_weights')
+def _fruit_weights(rng, size=100):
+    # One column for each fruit.
+    return rng.normal([130, 125, 120], [10, 20, 30], size=(size, 3))
 
-def bullet_level1(fig, y, text):
-    """
-    Create a level 1 list item.
-
-    Parameters
-    ----------
-    fig : matplotlib.figure.Figure
-        A slide figure.
-    y : float
-        The vertical position for the list item, in 0-1 figure space.
-    text : str
-        The text to place in the list item.
-    """
-    return fig.text(0.05, y, text,
-                    fontproperties=FONT, fontsize=48, alpha=0.7,
-                    verticalalignment='top')
+
+@dataset('stackplot_data')
+def _stackplot_data(rng, rows=4, cols=10):
+    return (
+        np.reshape(np.arange(0, cols, 1), (1, -1)) ** 2 +
+        np.reshape(np.arange(0, rows), (-1, 1)) +
+        rng.random((rows, cols))*5
+    )
 
 
-def bullet_level2(fig, y, text, **kwargs):
-    """
-    Create a level 2 list item.
-
-    This is roughly the same as level 1, but not bolded, and indented more.
-
-    Parameters
-    ----------
-    fig : matplotlib.figure.Figure
-        A slide figure.
-    y : float
-        The vertical position for the list item, in 0-1 figure space.
-    text : str
-        The text to place in the list item.
-    """
-    return fig.text(0.1, y, text,
-                    **{'fontproperties': FONT, 'fontsize': 48, 'fontweight': 'normal',
-                       'alpha': 0.7, 'verticalalignment': 'top', **kwargs})
+@dataset('violin_samples')
+def _violin_samples(rng, size=100):
+    return rng.normal(0, 8, size=size)
 
 
 def boxplot_legend():
@@ -55,17 +36,12 @@ def boxplot_legend():
     fig = new_slide()
     slide_heading(fig, '3.9: Legend support for boxplot')
 
-    bullet_level2(fig, 0.80,
-                  'ax.boxplot(fruit_weights,\n'
-                  '           label=["peaches", "oranges", "tomatoes"])',
-                  **CODE)
-
-    np.random.seed(19680801)
-    fruit_weights = [
-        np.random.normal(130, 10, size=100),
-        np.random.normal(125, 20, size=100),
-        np.random.normal(120, 30, size=100),
-    ]
+    fit_width(bullet_level2(fig, 0.80,
+                            'ax.boxplot(fruit_weights,\n'
+                            '           label=["peaches", "oranges", "tomatoes"])',
+                            **CODE))
+
+    fruit_weights = get_dataset('fruit_weights')
     labels = ['peaches', 'oranges', 'tomatoes']
     colors = ['peachpuff', 'orange', 'tomato']
 
@@ -98,13 +74,7 @@ def stackplot_hatch():
 
     ax1, ax2 = fig.subplots(ncols=2)
 
-    cols = 10
-    rows = 4
-    data = (
-        np.reshape(np.arange(0, cols, 1), (1, -1)) ** 2 +
-        np.reshape(np.arange(0, rows), (-1, 1)) +
-        np.random.random((rows, cols))*5
-    )
+    data = get_dataset('stackplot_data')
     x = range(data.shape[1])
     ax1.stackplot(x, data, hatch='x')
     ax2.stackplot(x, data, hatch=['//', '\\', 'x', 'o'])
@@ -129,8 +99,7 @@ def violin_sides():
     fig = new_slide()
     slide_heading(fig, '3.9: Violinplot sides')
 
-    np.random.seed(19680801)
-    data = np.random.normal(0, 8, size=100)
+    data = get_dataset('violin_samples')
 
     ax = fig.subplots()
     ax.violinplot(data, [0], showmeans=True, showextrema=True)
@@ -146,12 +115,18 @@ def violin_sides():
     return fig
 
 
+def prefetch():
+    """
+    Start preparing the data for this section.
+    """
+    for name in ['fruit_weights', 'stackplot_data', 'violin_samples']:
+        get_dataset.prefetch(name)
+
+
 def slides():
     """
-    Return slides for this section.
+    Yield slides for this section.
     """
-    return (
-        boxplot_legend(),
-        stackplot_hatch(),
-        violin_sides(),
-    )
+    yield boxplot_legend()
+    yield stackplot_hatch()
+    yield violin_sides()
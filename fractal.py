@@ -0,0 +1,127 @@
+"""
+Computation of fractals and other fields over a grid, in tiles.
+
+Fields are computed in place on single-precision tiles, with only a few
+tile-sized temporaries, and tiles are spread over a pool of threads. NumPy
+releases the GIL in its loops, so this scales with the number of cores even
+for large (e.g., 4K) grids.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+import numpy as np
+
+
+#: The number of grid rows in each tile.
+TILE_ROWS = 64
+
+
+def render_tiles(func, shape, dtype, tile_rows=TILE_ROWS, workers=None):
+    """
+    Compute a field over a grid, one tile of rows at a time.
+
+    Parameters
+    ----------
+    func : callable
+        Called as ``func(out, rows)`` for each tile, where *out* is the view of
+        the result to fill in, and *rows* the slice of the grid it covers. It
+        is called from several threads at once.
+    shape : (int, int)
+        The number of rows and columns in the grid.
+    dtype : dtype
+        The type of the result.
+    tile_rows : int, default: `TILE_ROWS`
+        The number of rows in each tile.
+    workers : int, optional
+        The number of threads to use; defaults to the number of CPUs.
+
+    Returns
+    -------
+    np.ndarray
+        The field, of the given *shape* and *dtype*.
+    """
+    result = np.empty(shape, dtype=dtype)
+    tiles = [slice(start, min(start + tile_rows, shape[0]))
+             for start in range(0, shape[0], tile_rows)]
+    workers = min(workers or os.cpu_count() or 1, len(tiles))
+    if workers <= 1:
+        for rows in tiles:
+            func(result[rows], rows)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Consume the results to raise any errors.
+            list(executor.map(lambda rows: func(result[rows], rows), tiles))
+    return result
+
+
+def mandelbrot(xlim, ylim, shape, iterations, radius=2, dtype=np.complex64,
+               tile_rows=TILE_ROWS, workers=None):
+    """
+    Iterate :math:`z_i = z_{i-1}^2 + c` with :math:`z_0 = c` over a grid.
+
+    Parameters
+    ----------
+    xlim, ylim : (float, float)
+        The range of the real and imaginary parts of *c*.
+    shape : (int, int)
+        The number of points along the imaginary and real axes.
+    iterations : int
+        The number of iterations.
+    radius : float, default: 2
+        The escape radius. Once a point's magnitude exceeds this, *c* is no
+        longer added to it, and it is scaled back to this magnitude after each
+        squaring. Its direction is then only an approximation of that of the
+        (diverging) exact iterate, as *c* is dropped.
+    dtype : {np.complex64, np.complex128}
+        The precision in which to iterate.
+    tile_rows, workers :
+        Passed to `render_tiles`.
+
+    Returns
+    -------
+    x, y : np.ndarray
+        The real and imaginary parts of *c* along each axis of the grid.
+    z : np.ndarray
+        The final value at each point of the grid.
+    escaped : np.ndarray of int
+        The iteration at which each point escaped, or 0 if it did not.
+    """
+    real = np.finfo(dtype).dtype
+    x = np.linspace(*xlim, shape[1], dtype=real)
+    y = np.linspace(*ylim, shape[0], dtype=real)
+    escaped = np.zeros(shape, dtype=np.min_scalar_type(iterations))
+    radius2 = real.type(radius)**2
+
+    def tile(z, rows):
+        c = np.empty_like(z)
+        c.real = x
+        c.imag = y[rows, np.newaxis]
+        z[...] = c
+        norm = np.empty(z.shape, dtype=real)
+        tmp = np.empty(z.shape, dtype=real)
+        active = np.ones(z.shape, dtype=bool)
+        newly = np.empty(z.shape, dtype=bool)
+        with np.errstate(over='ignore', invalid='ignore'):
+            for i in range(1, iterations + 1):
+                np.multiply(z, z, out=z)
+                np.add(z, c, out=z, where=active)
+                np.multiply(z.real, z.real, out=norm)
+                np.multiply(z.imag, z.imag, out=tmp)
+                np.add(norm, tmp, out=norm)
+                # Mark points that escape on this iteration, and stop iterating them.
+                np.greater(norm, radius2, out=newly)
+                np.logical_and(newly, active, out=newly)
+                np.copyto(escaped[rows], i, where=newly)
+                np.not_equal(active, newly, out=active)
+                # Hold escaped points at the escape radius, so they cannot
+                # overflow, but keep squaring them, as the direction in which
+                # they diverge is still meaningful. Only escaped points are
+                # scaled, as active points may be exactly 0.
+                np.logical_not(active, out=newly)
+                np.sqrt(norm, out=norm, where=newly)
+                np.divide(radius, norm, out=norm, where=newly)
+                np.multiply(z, norm, out=z, where=newly)
+
+    z = render_tiles(tile, shape, dtype, tile_rows=tile_rows, workers=workers)
+    return x, y, z, escaped
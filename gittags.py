@@ -0,0 +1,338 @@
+"""
+Reading of release tags from a git repository, without running git.
+
+Tags are read directly from the refs and object database of the repository,
+and indexed on disk, so that the index only needs to be refreshed when tags are
+added, moved, or removed.
+"""
+
+import bisect
+from datetime import datetime, timedelta, timezone
+import json
+import mmap
+import os
+import pathlib
+import subprocess
+import threading
+import zlib
+
+
+#: Pack object types, by their number in the pack format.
+_PACK_TYPES = {1: b'commit', 2: b'tree', 3: b'blob', 4: b'tag'}
+_OFS_DELTA = 6
+_REF_DELTA = 7
+
+
+def find_git_dir(path):
+    """
+    Return the directory containing the refs and objects of a repository.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        The path to a checkout (or worktree) or a bare repository.
+    """
+    path = pathlib.Path(path)
+    git_dir = path / '.git'
+    if git_dir.is_file():
+        # A worktree or submodule, which points to its real git directory.
+        git_dir = path / git_dir.read_text().removeprefix('gitdir:').strip()
+    elif not git_dir.is_dir():
+        git_dir = path
+    commondir = git_dir / 'commondir'
+    if commondir.is_file():
+        git_dir = git_dir / commondir.read_text().strip()
+    return git_dir.resolve()
+
+
+def _read_varint(data, pos):
+    """Read a little-endian base-128 integer, as used in deltas."""
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, pos
+
+
+def _apply_delta(base, delta):
+    """Reconstruct an object from its *base* and a git *delta*."""
+    _, pos = _read_varint(delta, 0)  # Size of the base.
+    size, pos = _read_varint(delta, pos)
+    result = bytearray()
+    while pos < len(delta):
+        op = delta[pos]
+        pos += 1
+        if op & 0x80:  # Copy from the base.
+            offset = length = 0
+            for i in range(4):
+                if op & (1 << i):
+                    offset |= delta[pos] << (8 * i)
+                    pos += 1
+            for i in range(3):
+                if op & (1 << (4 + i)):
+                    length |= delta[pos] << (8 * i)
+                    pos += 1
+            result += base[offset:offset + (length or 0x10000)]
+        elif op:  # Insert new data.
+            result += delta[pos:pos + op]
+            pos += op
+        else:
+            raise ValueError('Invalid delta instruction')
+    if len(result) != size:
+        raise ValueError('Delta produced an object of the wrong size')
+    return bytes(result)
+
+
+class _Pack:
+    """A pack file and its (version 2) index."""
+
+    def __init__(self, idx_path):
+        with open(idx_path, 'rb') as f:
+            self._idx = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(idx_path.with_suffix('.pack'), 'rb') as f:
+            self._pack = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._idx[:8] != b'\377tOc\0\0\0\2':
+            raise ValueError(f'Unsupported pack index: {idx_path}')
+        self._count = int.from_bytes(self._idx[8 + 255 * 4:8 + 256 * 4], 'big')
+        self._names = 8 + 256 * 4
+        self._offsets = self._names + self._count * (20 + 4)
+        self._large_offsets = self._offsets + self._count * 4
+
+    def _fanout_at(self, byte):
+        if byte < 0:
+            return 0
+        start = 8 + byte * 4
+        return int.from_bytes(self._idx[start:start + 4], 'big')
+
+    def offset(self, sha):
+        """Return the offset of object *sha* (as bytes), or None if missing."""
+        names = self._names
+        lo, hi = self._fanout_at(sha[0] - 1), self._fanout_at(sha[0])
+        key = (lambda i: self._idx[names + i * 20:names + (i + 1) * 20])
+        i = bisect.bisect_left(range(lo, hi), sha, key=key) + lo
+        if i == hi or key(i) != sha:
+            return None
+        start = self._offsets + i * 4
+        offset = int.from_bytes(self._idx[start:start + 4], 'big')
+        if offset & 0x80000000:
+            start = self._large_offsets + (offset & 0x7fffffff) * 8
+            offset = int.from_bytes(self._idx[start:start + 8], 'big')
+        return offset
+
+    def _inflate(self, pos):
+        decompressor = zlib.decompressobj()
+        chunks = []
+        while not decompressor.eof:
+            chunks.append(decompressor.decompress(self._pack[pos:pos + 4096]))
+            pos += 4096
+        return b''.join(chunks)
+
+    def read(self, offset, store):
+        """Return the type and contents of the object at *offset*."""
+        data = self._pack
+        byte = data[offset]
+        kind = (byte >> 4) & 0x7
+        pos = offset + 1
+        while byte & 0x80:  # Skip the size, which is implied by the data.
+            byte = data[pos]
+            pos += 1
+        if kind == _OFS_DELTA:
+            byte = data[pos]
+            pos += 1
+            base_offset = byte & 0x7f
+            while byte & 0x80:
+                byte = data[pos]
+                pos += 1
+                base_offset = ((base_offset + 1) << 7) | (byte & 0x7f)
+            kind, base = self.read(offset - base_offset, store)
+            return kind, _apply_delta(base, self._inflate(pos))
+        if kind == _REF_DELTA:
+            kind, base = store.read(bytes(data[pos:pos + 20]))
+            return kind, _apply_delta(base, self._inflate(pos + 20))
+        return _PACK_TYPES[kind], self._inflate(pos)
+
+
+class _ObjectStore:
+    """Read access to the loose and packed objects of a repository."""
+
+    def __init__(self, git_dir):
+        self._objects = git_dir / 'objects'
+        self._packs = None
+
+    def read(self, sha):
+        """
+        Return the type and contents of object *sha* (as bytes).
+
+        Raises
+        ------
+        KeyError
+            If the object is not found.
+        """
+        hexsha = sha.hex()
+        loose = self._objects / hexsha[:2] / hexsha[2:]
+        if loose.is_file():
+            data = zlib.decompress(loose.read_bytes())
+            header, _, contents = data.partition(b'\0')
+            return header.split(b' ', 1)[0], contents
+        if self._packs is None:
+            self._packs = [_Pack(idx)
+                           for idx in sorted((self._objects / 'pack').glob('*.idx'))]
+        for pack in self._packs:
+            offset = pack.offset(sha)
+            if offset is not None:
+                return pack.read(offset, self)
+        raise KeyError(hexsha)
+
+
+def _signature_date(line):
+    """Return the date (in its own timezone) of a tagger or committer line."""
+    *_, timestamp, tz = line.rsplit(b' ', 2)
+    sign = -1 if tz.startswith(b'-') else 1
+    offset = timedelta(hours=int(tz[1:3]), minutes=int(tz[3:5])) * sign
+    return datetime.fromtimestamp(int(timestamp), timezone(offset)).date().isoformat()
+
+
+def _creator_date(store, sha):
+    """
+    Return the date a tag was created, as ``git tag --format=%(creatordate)``.
+
+    This is the date of an annotated tag, or of the commit of a lightweight tag;
+    None is returned for tags of anything else.
+    """
+    kind, contents = store.read(bytes.fromhex(sha))
+    field = {b'tag': b'tagger ', b'commit': b'committer '}.get(kind)
+    if field is None:
+        return None
+    headers = contents.split(b'\n\n', 1)[0]
+    for line in headers.split(b'\n'):
+        if line.startswith(field):
+            return _signature_date(line)
+    return None
+
+
+def _read_refs(git_dir):
+    """Return the object of each tag, from packed and loose refs."""
+    refs = {}
+    packed_refs = git_dir / 'packed-refs'
+    if packed_refs.is_file():
+        for line in packed_refs.read_text().splitlines():
+            if line.startswith(('#', '^')):
+                continue
+            sha, _, ref = line.partition(' ')
+            if ref.startswith('refs/tags/'):
+                refs[ref.removeprefix('refs/tags/')] = sha
+    tags_dir = git_dir / 'refs' / 'tags'
+    for root, _, files in os.walk(tags_dir):
+        for name in files:
+            path = pathlib.Path(root, name)
+            sha = path.read_text().strip()
+            if len(sha) == 40:  # Skip anything odd, like lock files.
+                refs[path.relative_to(tags_dir).as_posix()] = sha
+    return refs
+
+
+def _ref_stamps(git_dir):
+    """
+    Return the modification times of everything that may list tags.
+
+    Adding, moving, or deleting any tag changes at least one of these.
+    """
+    stamps = {}
+    packed_refs = git_dir / 'packed-refs'
+    if packed_refs.exists():
+        stamps['packed-refs'] = packed_refs.stat().st_mtime_ns
+    tags_dir = git_dir / 'refs' / 'tags'
+    for root, _, _ in os.walk(tags_dir):
+        stamps[pathlib.Path(root).relative_to(git_dir).as_posix()] = (
+            os.stat(root).st_mtime_ns)
+    return stamps
+
+
+def tag_state(path):
+    """
+    Return data that changes whenever a tag of a repository changes.
+
+    This is cheap to find, as no refs or objects are read.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        The path to a git checkout.
+    """
+    git_dir = find_git_dir(path)
+    return {'git_dir': str(git_dir), 'stamps': _ref_stamps(git_dir)}
+
+
+def _read_tags_with_git(git_dir):
+    """Return the creation date of each tag, as reported by git itself."""
+    output = subprocess.run(
+        ['git', '--git-dir', git_dir, 'for-each-ref',
+         '--format=%(refname:strip=2) %(objectname) %(creatordate:short)',
+         'refs/tags'],
+        capture_output=True, text=True, check=True).stdout
+    tags = {}
+    for line in output.splitlines():
+        name, sha, date = (line.split(' ', 2) + [''])[:3]
+        tags[name] = [sha, date or None]
+    return tags
+
+
+def read_tags(path, cache=None):
+    """
+    Return the tags of a git repository and the dates they were created.
+
+    Refs and objects are read directly, so git is not run, unless an object
+    cannot be read (e.g., it is in an alternate object store), in which case
+    all dates are read with git instead.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        The path to a git checkout.
+    cache : str or pathlib.Path, optional
+        A JSON file in which to store the index of tags. If it is up to date,
+        nothing else is read; otherwise, only new or moved tags are resolved.
+
+    Returns
+    -------
+    dict
+        Mapping of tag name to its creation date, as an ISO 8601 string. Tags
+        that do not refer to a commit or annotated tag are omitted.
+    """
+    git_dir = find_git_dir(path)
+    stamps = _ref_stamps(git_dir)
+    index = None
+    if cache is not None:
+        cache = pathlib.Path(cache)
+        try:
+            index = json.loads(cache.read_text())
+        except (OSError, ValueError):
+            pass
+        if index is not None and index.get('git_dir') != str(git_dir):
+            index = None
+    if index is None or index['stamps'] != stamps:
+        old_tags = {} if index is None else index['tags']
+        tags = {}
+        store = _ObjectStore(git_dir)
+        try:
+            for name, sha in _read_refs(git_dir).items():
+                if name in old_tags and old_tags[name][0] == sha:
+                    tags[name] = old_tags[name]
+                else:
+                    tags[name] = [sha, _creator_date(store, sha)]
+        except (KeyError, ValueError):
+            tags = _read_tags_with_git(git_dir)
+        index = {'git_dir': str(git_dir), 'stamps': stamps, 'tags': tags}
+        if cache is not None:
+            cache.parent.mkdir(parents=True, exist_ok=True)
+            # Write under a unique name, as several builds (or a prefetch and a
+            # slide) may share the cache directory.
+            tmp = cache.with_name(
+                f'{cache.name}.{os.getpid()}-{threading.get_ident()}.tmp')
+            tmp.write_text(json.dumps(index))
+            tmp.replace(cache)
+    return {name: date for name, (_, date) in sorted(index['tags'].items())
+            if date is not None}
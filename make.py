@@ -3,59 +3,696 @@
 """
 Generate slides for the presentation.
 
-Usage: ./make.py /path/to/matplotlib/checkout
+Usage: ./make.py [--jobs N] [--no-cache] [--only SECTION,...] [--list]
+                 [--format pdf,png,svg,html] [--geometry 16:9,4:3,...] [--profile]
+                 [--serve [--port PORT]]
+                 /path/to/matplotlib/checkout
 
 You must make a clone of the Matplotlib git repository available, and should
 have the Carlito and/or Calibri font installed.
 """
 
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+import functools
+import gc
+import importlib
+import importlib.util
+import inspect
+import io
+import pathlib
 import shutil
 import subprocess
 import sys
+import tempfile
+import time
+import traceback
 
-from matplotlib.backends.backend_pdf import PdfPages
-
-from mplslide import check_requirements
-# This must be called before importing other files to make the font available.
-check_requirements()  # noqa: F402
-
-from title import create_icon_axes, slides as title_slides
-from timeline import slides as history_slides
-from feature38 import slides as feature38_slides
-from feature39 import slides as feature39_slides
-from feature310 import slides as feature310_slides
-from end import slides as end_slides
+from slideprofile import NullProfiler, SlideProfiler
 
 
 METADATA = {
     'Author': 'Elliott Sales de Andrade',
     'Title': 'Matplotlib Project Update for SciPy 2024',
 }
-MPL_PATH = sys.argv[1]
-PAGES = [
-    # Tuple of function + any arguments.
-    (title_slides, ),
-    (history_slides, MPL_PATH, ),
-    (feature38_slides, ),
-    (feature39_slides, ),
-    (feature310_slides, ),
-    (end_slides, ),
-]
-
-with PdfPages('slides.pdf', metadata=METADATA) as pdf:
-    for page, *args in PAGES:
+#: Named slide sizes, in inches, for common aspect ratios; all have the same
+#: height, so that text sizes suit each.
+GEOMETRIES = {
+    '16:9': (19.2, 10.8),
+    '16:10': (17.28, 10.8),
+    '4:3': (14.4, 10.8),
+}
+#: Modules shared by the sections, which are reloaded along with all sections
+#: when they change in preview mode.
+SHARED_MODULES = ['mplslide', 'fractal', 'gittags', 'slidepdf', 'title']
+#: The sections of the presentation, in order. Each is the name of a module
+#: with a ``slides`` function, mapped to the names of any command-line
+#: arguments to pass to it. Modules are only imported when they are built.
+SECTIONS = {
+    'title': (),
+    'timeline': ('mpl_path', 'cache_dir', 'timeline_years'),
+    'feature38': (),
+    'feature39': (),
+    'feature310': (),
+    'end': (),
+}
+
+
+def get_pages(args, only=None):
+    """
+    Return the sections of the presentation to build, in order.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The command-line arguments, from which section arguments are taken.
+    only : list of str, optional
+        The names of the sections to build; if not given, build all sections.
+
+    Returns
+    -------
+    list of tuple
+        Tuple of function + any arguments.
+    """
+    pages = []
+    for name, arg_names in SECTIONS.items():
+        if only is not None and name not in only:
+            continue
+        module = importlib.import_module(name)
+        pages.append((module.slides, *(getattr(args, arg) for arg in arg_names)))
+    return pages
+
+
+def parse_geometries(value):
+    """
+    Parse a comma-separated list of slide geometries.
+
+    Each is a name from `GEOMETRIES`, or ``WIDTHxHEIGHT`` in inches, and may be
+    followed by ``@DPI``.
+
+    Returns
+    -------
+    list of (str, (float, float), float or None)
+        The label, size, and DPI (if given) of each geometry. The label is safe
+        to use in file names.
+    """
+    geometries = []
+    for spec in value.split(','):
+        name, _, dpi = spec.partition('@')
+        try:
+            if name in GEOMETRIES:
+                figsize = GEOMETRIES[name]
+            else:
+                figsize = tuple(float(size) for size in name.split('x'))
+                if len(figsize) != 2:
+                    raise ValueError
+            dpi = float(dpi) if dpi else None
+        except ValueError:
+            raise argparse.ArgumentTypeError(f'invalid geometry: {spec!r}')
+        label = name.replace(':', 'x') + (f'-{dpi:g}dpi' if dpi else '')
+        geometries.append((label, figsize, dpi))
+    return geometries
+
+
+@functools.cache
+def get_corner_logo(figsize, dpi):
+    """
+    Return a figure containing only the logo for the corner of slides.
+
+    This is only created once for each slide size, and shared by all slides.
+    """
+    from mplslide import CORNER_LOGO_POSITION, new_slide, slide_geometry
+    from title import create_icon_axes
+
+    with slide_geometry(figsize, dpi):
+        logo = new_slide(plain=True, frameon=False)
+    create_icon_axes(logo, CORNER_LOGO_POSITION, 0.3, 0.3, 0.3, [5])
+    return logo
+
+
+def cache_salt(exporter):
+    """
+    Return the data, besides each section itself, that affects its output.
+
+    This includes the source of all shared modules, which any section may use,
+    and of the exporter.
+    """
+    import export
+
+    return ''.join([
+        inspect.getsource(build_section),
+        inspect.getsource(get_corner_logo),
+        *(inspect.getsource(importlib.import_module(name))
+          for name in SHARED_MODULES),
+        inspect.getsource(export),
+        repr(exporter),
+    ])
+
+
+def prefetch_data(pages):
+    """
+    Start preparing the data of all *pages* in the background.
+
+    A section may define a ``prefetch`` function, taking the same arguments as
+    its ``slides``, which starts its slow data preparation with the
+    ``prefetch`` method of `mplslide.prefetchable` functions. This then
+    overlaps with rendering earlier sections.
+    """
+    for page, *args in pages:
+        prefetch = getattr(inspect.getmodule(page), 'prefetch', None)
+        if prefetch is not None:
+            prefetch(*args)
+
+
+def build_section(page, *args, profiler=None):
+    """
+    Create all figures for one section, with the corner logo added.
+
+    Dense artists are rasterized with `mplslide.rasterize_dense`, and any that
+    are, are listed for each slide.
+
+    Parameters
+    ----------
+    page : callable
+        The function creating the slides of the section. It may return a
+        single figure, a sequence of figures, or yield figures one at a time.
+    *args
+        Any arguments to pass to *page*.
+    profiler : slideprofile.SlideProfiler, optional
+        A profiler in which to record the construction and logo phases of each
+        slide. The caller should record the save phase before resuming.
+
+    Yields
+    ------
+    matplotlib.figure.Figure
+    """
+    from matplotlib.figure import Figure
+    import mplslide
+    from slidepdf import SharedFigureArtist
+
+    if profiler is None:
+        profiler = NullProfiler()
+
+    profiler.start_slide(page.__module__)
+    with profiler.phase('construct'):
         figs = page(*args)
-        if not isinstance(figs, (tuple, list)):
+        if isinstance(figs, Figure):
             figs = (figs, )
-        for fig in figs:
-            if not fig.mplslide_props['plain']:
-                create_icon_axes(fig, (0.825, 0.825, 0.2, 0.15),
-                                 0.3, 0.3, 0.3, [5])
-            pdf.savefig(fig)
-
-# Linearize the PDF if qpdf is available.
-if shutil.which('qpdf') is not None:
-    subprocess.run(['qpdf', 'slides.pdf', '--object-streams=generate',
-                    '--linearize', 'scipy2024-mpl-update.pdf'])
-else:
-    shutil.copy('slides.pdf', 'scipy2024-mpl-update.pdf')
+        figs = iter(figs)
+        fig = next(figs, None)
+    index = 0
+    while fig is not None:
+        with profiler.phase('construct'):
+            for name, cost in mplslide.rasterize_dense(fig):
+                print(f'{page.__module__}:{index}: rasterized {name} '
+                      f'({cost:,.0f} vertices)')
+        if not fig.mplslide_props['plain']:
+            with profiler.phase('logo'):
+                # Draw after any Axes (zorder 0), but below any text.
+                logo = get_corner_logo(mplslide.FIGSIZE, mplslide.DPI)
+                fig.add_artist(SharedFigureArtist(logo, zorder=0.5))
+        yield fig
+        index += 1
+        profiler.start_slide(page.__module__)
+        with profiler.phase('construct'):
+            fig = next(figs, None)
+    profiler.discard_slide()
+
+
+def release_figure(fig):
+    """
+    Free the memory of a figure once it has been saved.
+
+    Figures contain reference cycles (e.g., between Axes and their Figure), so
+    the garbage collector is run to free them right away, instead of letting
+    large arrays pile up over the course of the deck.
+    """
+    fig.clear()
+    gc.collect()
+
+
+def peak_memory():
+    """
+    Return the peak resident set size of this process and its children, in MiB.
+    """
+    try:
+        import resource
+    except ImportError:  # Not available on Windows.
+        return None
+    # On macOS, ru_maxrss is in bytes; elsewhere, it is in KiB.
+    scale = 2**20 if sys.platform == 'darwin' else 2**10
+    return max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) / scale
+
+
+def init_worker(cache_dir, vector_limit):
+    """
+    Set up fonts, datasets, assets, and the rasterization limit in a worker
+    process, without repeating any warnings.
+    """
+    import mplslide
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        mplslide.check_requirements(pathlib.Path(cache_dir, 'fonts.json'),
+                                    update_cache=False)
+    mplslide.use_dataset_cache(pathlib.Path(cache_dir, 'datasets'))
+    mplslide.use_asset_cache(pathlib.Path(cache_dir, 'assets'))
+    mplslide.VECTOR_COST_LIMIT = vector_limit
+
+
+def render_fragments(outdir, index, page, *args, exporter=None, geometry=None):
+    """
+    Render one section into single-page PDF fragments.
+
+    This is run in a worker process when building in parallel.
+
+    Parameters
+    ----------
+    outdir : pathlib.Path
+        Directory in which to place the fragments.
+    index : int
+        The position of the section in the presentation; the fragments are
+        placed in a subdirectory named after it.
+    page : callable
+        The function creating the slides of the section.
+    *args
+        Any arguments to pass to *page*.
+    exporter : export.SlideExporter, optional
+        If given, also export each slide to other formats next to its
+        fragment.
+    geometry : (figsize, dpi), optional
+        The size and DPI of the slides, if not the default.
+
+    Returns
+    -------
+    list of pathlib.Path
+        The fragments, and any exported files, named after the position of
+        the slide in the section.
+    """
+    from mplslide import slide_geometry
+    from slidepdf import SlidePdfPages
+
+    outdir = outdir / f'{index:03d}'
+    outdir.mkdir()
+    files = []
+    with exporter or contextlib.nullcontext(), \
+            slide_geometry(*geometry) if geometry else contextlib.nullcontext():
+        for i, fig in enumerate(build_section(page, *args)):
+            fragment = outdir / f'{i:03d}.pdf'
+            with SlidePdfPages(fragment, metadata=METADATA) as pdf:
+                pdf.savefig(fig)
+            files.append(fragment)
+            if exporter:
+                files.extend(exporter.save(fig, outdir / f'{i:03d}'))
+            release_figure(fig)
+    return sorted(files)
+
+
+def collect_exports(sections, outdir):
+    """
+    Copy exported files from rendered *sections* into *outdir*.
+
+    The files are renamed to be numbered by their slide in the whole
+    presentation, instead of in their section.
+    """
+    start = 1
+    for files in sections:
+        for file in files:
+            if file.suffix != '.pdf':
+                number = start + int(file.name[:3])
+                shutil.copy(file, outdir / f'{number:03d}{file.name[3:]}')
+        start += sum(1 for file in files if file.suffix == '.pdf')
+
+
+def save_serial(pages, filename, profiler=None, exporter=None, outdir=None):
+    """
+    Render all *pages* into *filename* in this process.
+
+    If a *profiler* is given, each phase of building each slide is recorded in
+    it. If an *exporter* is given, each slide is also exported into *outdir*.
+    """
+    from slidepdf import SlidePdfPages
+
+    if profiler is None:
+        profiler = NullProfiler()
+
+    prefetch_data(pages)
+    number = 1
+    with SlidePdfPages(filename, metadata=METADATA) as pdf, \
+            exporter or contextlib.nullcontext():
+        for page, *args in pages:
+            for fig in build_section(page, *args, profiler=profiler):
+                with profiler.phase('save'):
+                    pdf.savefig(fig)
+                if exporter:
+                    exporter.save(fig, outdir / f'{number:03d}')
+                release_figure(fig)
+                number += 1
+
+
+def save_fragments(pages, filename, jobs=1, cache=None, exporter=None,
+                   outdir=None, cache_dir=None, geometry=None):
+    """
+    Render all *pages* into *filename* via single-page fragments.
+
+    Each section is rendered to per-page fragments, which are then merged in
+    order. Hyperlinks are kept, and the document information is taken from the
+    first fragment, so it matches the serial build. Objects that are identical
+    between fragments are only written once.
+
+    Parameters
+    ----------
+    pages : list of tuple
+        The sections to render, as from `get_pages`.
+    filename : str or pathlib.Path
+        The output PDF file.
+    jobs : int, default: 1
+        The number of worker processes to render sections with; if 1, render
+        in this process.
+    cache : pagecache.PageCache, optional
+        A cache from which unchanged sections are reused, and into which newly
+        rendered sections are stored.
+    exporter : export.SlideExporter, optional
+        If given, also export each slide to other formats, into *outdir*.
+    outdir : pathlib.Path, optional
+        The directory in which to place exported slides.
+    cache_dir : pathlib.Path, optional
+        The directory of the font and dataset caches to use when setting up
+        worker processes.
+    geometry : (figsize, dpi), optional
+        The size and DPI of the slides, if not the default.
+    """
+    try:
+        from pypdf import PdfReader, PdfWriter
+    except ImportError:
+        sys.exit('Building with --jobs or the page cache requires the pypdf '
+                 'library.')
+    import mplslide
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = pathlib.Path(tmpdir)
+        sections = [None] * len(pages)
+        keys = [None] * len(pages)
+        todo = []
+        for index, (page, *args) in enumerate(pages):
+            if cache is not None:
+                keys[index] = cache.key(page, args)
+                sections[index] = cache.get(keys[index])
+            if sections[index] is None:
+                todo.append((index, page, args))
+
+        if jobs > 1 and len(todo) > 1:
+            with ProcessPoolExecutor(
+                    max_workers=jobs, initializer=init_worker,
+                    initargs=(cache_dir, mplslide.VECTOR_COST_LIMIT)) as executor:
+                futures = {
+                    index: executor.submit(render_fragments, tmpdir, index, page,
+                                           *args, exporter=exporter,
+                                           geometry=geometry)
+                    for index, page, args in todo
+                }
+                rendered = {index: future.result() for index, future in futures.items()}
+        else:
+            prefetch_data([(page, *args) for _, page, args in todo])
+            rendered = {index: render_fragments(tmpdir, index, page, *args,
+                                                exporter=exporter,
+                                                geometry=geometry)
+                        for index, page, args in todo}
+
+        for index, files in rendered.items():
+            if cache is not None:
+                files = cache.put(keys[index], files)
+            sections[index] = files
+
+        fragments = [file for files in sections for file in files
+                     if file.suffix == '.pdf']
+        writer = PdfWriter()
+        for fragment in fragments:
+            writer.append(fragment)
+        writer.add_metadata(PdfReader(fragments[0]).metadata)
+        writer.compress_identical_objects()
+        with open(filename, 'wb') as f:
+            writer.write(f)
+
+        if exporter:
+            collect_exports(sections, outdir)
+
+    if cache is not None:
+        cache.evict()
+        print(cache.stats())
+
+
+def serve_preview(args, fmt='png'):
+    """
+    Serve the slides for preview, rebuilding them whenever their source changes.
+
+    Matplotlib, the fonts, and all slide modules stay loaded. When a section
+    module changes, only it is reloaded and rebuilt; when a shared module
+    changes, everything is. Slides are built in the first geometry given. This
+    runs until interrupted.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The command-line arguments.
+    fmt : {'png', 'svg'}, default: 'png'
+        The format in which to serve slides.
+    """
+    from preview import PREVIEW_WIDTH, PreviewServer, SourceWatcher
+
+    names = [name for name in SECTIONS if args.only is None or name in args.only]
+    server = PreviewServer(args.port, fmt)
+    server.set_order(names)
+
+    _, figsize, dpi = args.geometry[0]
+
+    def render(name):
+        # This is imported each time, as it may have been reloaded.
+        from mplslide import slide_geometry
+
+        module = importlib.import_module(name)
+        slides = []
+        with slide_geometry(figsize, dpi):
+            for fig in build_section(module.slides,
+                                     *(getattr(args, arg) for arg in SECTIONS[name])):
+                buf = io.BytesIO()
+                if fmt == 'png':
+                    # Render at the width shown on the page, and favour speed
+                    # over size, as the preview is only served locally.
+                    fig.savefig(buf, format='png',
+                                dpi=PREVIEW_WIDTH / fig.get_figwidth(),
+                                pil_kwargs={'compress_level': 1})
+                else:
+                    fig.savefig(buf, format=fmt)
+                slides.append(buf.getvalue())
+                release_figure(fig)
+        server.publish(name, slides)
+
+    def rebuild(changed):
+        start = time.perf_counter()
+        try:
+            if any(name in SHARED_MODULES for name in changed):
+                for name in SHARED_MODULES:
+                    importlib.reload(importlib.import_module(name))
+                init_worker(args.cache_dir, args.vector_limit)
+                get_corner_logo.cache_clear()
+                changed = names
+            for name in changed:
+                if name in sys.modules:
+                    importlib.reload(sys.modules[name])
+                render(name)
+        except Exception:
+            message = traceback.format_exc()
+            print(message, file=sys.stderr)
+            server.publish_error(message)
+        else:
+            print(f'Rebuilt {", ".join(changed)} in '
+                  f'{time.perf_counter() - start:.2f}s')
+
+    prefetch_data([(importlib.import_module(name).slides,
+                    *(getattr(args, arg) for arg in SECTIONS[name]))
+                   for name in names])
+    for name in names:
+        render(name)
+    watcher = SourceWatcher(names + SHARED_MODULES)
+    server.start()
+    print(f'Serving preview at {server.url}; press Ctrl+C to stop.')
+    try:
+        while True:
+            time.sleep(0.1)
+            changed = watcher.poll()
+            if changed:
+                rebuild(changed)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate slides for the presentation.')
+    parser.add_argument('mpl_path', nargs='?',
+                        help='Path to a Matplotlib checkout, for the timeline.')
+    parser.add_argument('--only', type=lambda value: value.split(','),
+                        metavar='SECTION,...',
+                        help='Comma-separated sections to build, instead of all.')
+    parser.add_argument('--list', action='store_true',
+                        help='List the available sections and exit.')
+    parser.add_argument('--timeline-years', type=int, default=5, metavar='YEARS',
+                        help='Number of years of releases to show in the '
+                             'timeline (default: %(default)s).')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Number of processes to render sections with.')
+    parser.add_argument('--cache-dir', default='.slidecache',
+                        help='Directory in which to cache rendered sections, '
+                             'fonts, release tags, datasets, and assets.')
+    parser.add_argument('--cache-size', type=int, default=256,
+                        help='Maximum size of the page cache, in MiB.')
+    parser.add_argument('--no-cache', dest='cache', action='store_false',
+                        help='Render all sections without using the page cache.')
+    parser.add_argument('--format', type=lambda value: value.split(','),
+                        default=['pdf'], metavar='FORMAT,...',
+                        help='Comma-separated output formats, from pdf, png, '
+                             'svg, and html; the PDF is always written.')
+    parser.add_argument('--png-dpi', type=lambda value: [float(dpi) for dpi in
+                                                         value.split(',')],
+                        default=[100], metavar='DPI,...',
+                        help='Comma-separated resolutions at which to write PNG '
+                             'slides (default: 100).')
+    parser.add_argument('--output-dir', type=pathlib.Path, default='slides',
+                        help='Directory in which to write PNG, SVG, and HTML slides.')
+    parser.add_argument('--geometry', type=parse_geometries, default='16:9',
+                        metavar='GEOMETRY,...',
+                        help='Comma-separated slide sizes to build variants '
+                             f'for, each one of {", ".join(GEOMETRIES)} or '
+                             'WIDTHxHEIGHT in inches, optionally followed by '
+                             '@DPI (default: %(default)s).')
+    parser.add_argument('--vector-limit', type=int, default=40_000,
+                        metavar='VERTICES',
+                        help='Rasterize artists estimated to draw more path '
+                             'vertices than this in vector output, or 0 to '
+                             'never rasterize (default: %(default)s).')
+    parser.add_argument('--profile', action='store_true',
+                        help='Profile each slide, printing a table and writing '
+                             'a JSON report. Profiled builds are serial and do '
+                             'not use the page cache.')
+    parser.add_argument('--profile-report', default='profile.json',
+                        metavar='REPORT',
+                        help='File in which to write the profiling report '
+                             '(default: %(default)s).')
+    parser.add_argument('--cprofile', action='store_true',
+                        help='When profiling, also record the most expensive '
+                             'functions of each slide with cProfile.')
+    parser.add_argument('--serve', action='store_true',
+                        help='Keep running, and serve a preview of the slides '
+                             'on localhost that is rebuilt when sources change.')
+    parser.add_argument('--port', type=int, default=8000,
+                        help='Port on which to serve the preview (default: '
+                             '%(default)s).')
+    args = parser.parse_args()
+
+    if args.list:
+        for name in SECTIONS:
+            print(name)
+        return
+    if args.only is not None:
+        unknown = set(args.only) - set(SECTIONS)
+        if unknown:
+            parser.error(f'unknown sections: {", ".join(sorted(unknown))}')
+    selected = SECTIONS if args.only is None else args.only
+    if args.mpl_path is None and any('mpl_path' in SECTIONS[name]
+                                     for name in selected):
+        parser.error('the Matplotlib path is required to build the timeline')
+    unknown = set(args.format) - {'pdf', 'png', 'svg', 'html'}
+    if unknown:
+        parser.error(f'unknown formats: {", ".join(sorted(unknown))}')
+
+    # Matplotlib is only imported once we know that slides will be built, so
+    # that listing sections or printing help is quick.
+    from export import SlideExporter, remove_html_slides, write_html_index
+    import mplslide
+    from mplslide import (
+        check_requirements, slide_geometry, use_asset_cache, use_dataset_cache)
+    from pagecache import PageCache
+
+    check_requirements(pathlib.Path(args.cache_dir, 'fonts.json'))
+    use_dataset_cache(pathlib.Path(args.cache_dir, 'datasets'))
+    use_asset_cache(pathlib.Path(args.cache_dir, 'assets'))
+    mplslide.VECTOR_COST_LIMIT = args.vector_limit
+
+    if args.serve:
+        serve_preview(args, 'svg' if 'svg' in args.format else 'png')
+        return
+
+    exporter = SlideExporter(png_dpis=args.png_dpi if 'png' in args.format else (),
+                             svg='svg' in args.format,
+                             html='html' in args.format)
+
+    if args.profile:
+        # Only the first variant is profiled, as slides are named by section.
+        _, figsize, dpi = args.geometry[0]
+        if exporter:
+            args.output_dir.mkdir(parents=True, exist_ok=True)
+        if 'html' in args.format:
+            remove_html_slides(args.output_dir)
+        profiler = SlideProfiler(cprofile=args.cprofile)
+        with slide_geometry(figsize, dpi):
+            save_serial(get_pages(args, args.only), 'slides.pdf', profiler,
+                        exporter, args.output_dir)
+            if 'html' in args.format:
+                write_html_index(args.output_dir,
+                                 get_corner_logo(mplslide.FIGSIZE, mplslide.DPI),
+                                 METADATA['Title'])
+        profiler.write_json(args.profile_report)
+        profiler.print_table()
+        return
+
+    if args.cache and importlib.util.find_spec('pypdf') is None:
+        print('WARNING: pypdf is not installed; not using the page cache.')
+        args.cache = False
+
+    # All variants are built in this process, so that data prepared by slides
+    # (fractals, QR codes, text measurements, etc.) is shared between them.
+    pages = get_pages(args, args.only)
+    for label, figsize, dpi in args.geometry:
+        # With a single variant, keep the usual file names.
+        suffix = f'-{label}' if len(args.geometry) > 1 else ''
+        outdir = args.output_dir / label if suffix else args.output_dir
+        if exporter:
+            outdir.mkdir(parents=True, exist_ok=True)
+        if 'html' in args.format:
+            remove_html_slides(outdir)
+        filename = f'slides{suffix}.pdf'
+        with slide_geometry(figsize, dpi):
+            if args.cache:
+                cache = PageCache(args.cache_dir, args.cache_size * 2**20,
+                                  salt=cache_salt(exporter))
+                save_fragments(pages, filename, args.jobs, cache, exporter,
+                               outdir, args.cache_dir, (figsize, dpi))
+            elif args.jobs > 1:
+                save_fragments(pages, filename, args.jobs, exporter=exporter,
+                               outdir=outdir, cache_dir=args.cache_dir,
+                               geometry=(figsize, dpi))
+            else:
+                save_serial(pages, filename, exporter=exporter, outdir=outdir)
+            if 'html' in args.format:
+                write_html_index(outdir,
+                                 get_corner_logo(mplslide.FIGSIZE, mplslide.DPI),
+                                 METADATA['Title'])
+
+        # Linearize the PDF if qpdf is available.
+        if shutil.which('qpdf') is not None:
+            subprocess.run(['qpdf', filename, '--object-streams=generate',
+                            '--linearize', f'scipy2024-mpl-update{suffix}.pdf'])
+        else:
+            shutil.copy(filename, f'scipy2024-mpl-update{suffix}.pdf')
+
+    peak = peak_memory()
+    if peak is not None:
+        print(f'Peak memory: {peak:.0f} MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -2,80 +2,406 @@
 Common functions for working with slides.
 """
 
-import io
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import dataclasses
+import functools
+import hashlib
+import inspect
+import json
+import math
+import os
 import pathlib
 import sys
+import threading
+import warnings
 
-import matplotlib.pyplot as plt
+import numpy as np
+import matplotlib
+import matplotlib.figure
 import matplotlib.font_manager
-from PIL import Image
-import segno
+from matplotlib.collections import Collection, QuadMesh
+from matplotlib.lines import Line2D
+from matplotlib.markers import MarkerStyle
+from matplotlib.patches import Patch, PathPatch, Rectangle
+from matplotlib.path import Path
 
 
 #: The blue used for Matplotlib logo.
 MPL_BLUE = '#11557c'
-#: The font to use for the Matplotlib logo.
-LOGO_FONT = None
+#: The font to use for the Matplotlib logo; its family is set by
+#: `check_requirements`.
+LOGO_FONT = matplotlib.font_manager.FontProperties(weight='bold')
 #: A bullet point.
 BULLET = '$\N{Bullet}$'
-#: The FontProperties to use, Carlito.
-FONT = None
-#: The size of a slide figure.
+#: The FontProperties to use, Carlito; its family is set by
+#: `check_requirements`.
+FONT = matplotlib.font_manager.FontProperties(weight='bold')
+#: The size of a slide figure; see `slide_geometry` to change it.
 FIGSIZE = (19.2, 10.8)
-#: The DPI of a slide figure.
+#: The DPI of a slide figure; see `slide_geometry` to change it.
 DPI = 100
+#: The position of the Axes of the logo in the corner of slides, in 0-1 figure
+#: space; headings end before it.
+CORNER_LOGO_POSITION = (0.825, 0.825, 0.2, 0.15)
+#: The seed for demo datasets, unless another is requested.
+SEED = 19680801
+#: The estimated cost of drawing an artist as vectors, in path vertices, above
+#: which `rasterize_dense` rasterizes it; e.g., a mesh of 10,000 cells.
+VECTOR_COST_LIMIT = 40_000
+#: Text properties for code.
+CODE = dict(fontfamily='monospace', fontsize=32, verticalalignment='top',
+            alpha=0.7)
 
 
-def check_requirements():
+def _font_cache_key(fonts):
     """
-    Check requirements to create the slides.
+    Return the data on which the resolved fonts depend.
 
-    Currently checks whether the path to a Matplotlib repository is specified,
-    and that the Carlito and/or Calibri fonts are available.
+    This is the mtime of the *fonts* directory, and the list of fonts known to
+    Matplotlib (which is itself cached by Matplotlib), so that finding fonts
+    is only repeated if either changes. Fonts that were added from the *fonts*
+    directory (e.g., by an earlier call in this process) are left out, so the
+    key is the same before and after they are added.
     """
+    fonts = fonts.resolve()
+    system_fonts = hashlib.sha256(
+        '\n'.join(sorted(font.fname for font in
+                         matplotlib.font_manager.fontManager.ttflist
+                         if not pathlib.Path(font.fname).is_relative_to(fonts))
+                  ).encode())
+    return {
+        'matplotlib': matplotlib.__version__,
+        'fonts_mtime': fonts.stat().st_mtime_ns if fonts.is_dir() else None,
+        'system_fonts': system_fonts.hexdigest(),
+    }
 
-    if len(sys.argv) < 2:
-        sys.exit('Usage: %s <matplotlib-path>' % (sys.argv[0], ))
-    fonts = pathlib.Path('fonts')
+
+def _find_fonts(fonts):
+    """
+    Add any fonts from the *fonts* directory, and find Calibri and Carlito.
+
+    Returns
+    -------
+    added : list of matplotlib.font_manager.FontEntry
+        The fonts that were added from the directory.
+    calibri, carlito : str or None
+        The path to the bold font file of each family, if available.
+    """
+    font_manager = matplotlib.font_manager.fontManager
+    count = len(font_manager.ttflist)
     if fonts.is_dir():
         for font in fonts.glob('*.ttf'):
-            matplotlib.font_manager.fontManager.addfont(font)
+            font_manager.addfont(font.resolve())
+    added = font_manager.ttflist[count:]
     # The original font is Calibri, if that is not installed, we fall back
     # to Carlito, which is metrically equivalent.
     calibri = carlito = None
     try:
-        matplotlib.font_manager.findfont('Calibri:bold', fallback_to_default=False)
+        calibri = matplotlib.font_manager.findfont('Calibri:bold',
+                                                   fallback_to_default=False)
     except ValueError:
         pass
-    else:
-        calibri = matplotlib.font_manager.FontProperties(family='Calibri',
-                                                         weight='bold')
     try:
-        matplotlib.font_manager.findfont('Carlito:bold', fallback_to_default=False)
+        carlito = matplotlib.font_manager.findfont('Carlito:bold',
+                                                   fallback_to_default=False)
     except ValueError:
         pass
+    return added, calibri, carlito
+
+
+def check_requirements(font_cache=None, update_cache=True):
+    """
+    Check requirements to create the slides.
+
+    Currently checks that the Carlito and/or Calibri fonts are available, and
+    sets the family of `FONT` and `LOGO_FONT` to match. As these are modified
+    in place, this may be called before or after importing the slides.
+
+    Parameters
+    ----------
+    font_cache : str or pathlib.Path, optional
+        A file in which to cache the fonts that were found. If it is up to date,
+        the fonts are not searched for again, and only those of the chosen
+        families are registered with Matplotlib.
+    update_cache : bool, default: True
+        Whether to write *font_cache* if it is out of date. Worker processes,
+        which inherit the fonts found by the main process, should not.
+    """
+
+    fonts = pathlib.Path('fonts')
+    font_manager = matplotlib.font_manager.fontManager
+    key = _font_cache_key(fonts)
+    cached = None
+    if font_cache is not None:
+        try:
+            with open(font_cache) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            pass
+    if cached is not None and cached['key'] == key:
+        known = {font.fname for font in font_manager.ttflist}
+        for entry in cached['fonts']:
+            if entry['fname'] not in known:
+                font_manager.ttflist.append(
+                    matplotlib.font_manager.FontEntry(**entry))
+        font_manager._findfont_cached.cache_clear()
+        calibri, carlito = cached['calibri'], cached['carlito']
     else:
-        carlito = matplotlib.font_manager.FontProperties(family='Carlito',
-                                                         weight='bold')
-    global FONT, LOGO_FONT
+        added, calibri, carlito = _find_fonts(fonts)
+        if font_cache is not None and update_cache:
+            families = {'Calibri', 'Carlito'}
+            font_cache = pathlib.Path(font_cache)
+            font_cache.parent.mkdir(parents=True, exist_ok=True)
+            # Replace the file at once, so that it is never read half-written.
+            tmp = font_cache.with_name(f'{font_cache.name}.{os.getpid()}.tmp')
+            with open(tmp, 'w') as f:
+                json.dump({
+                    'key': key,
+                    'fonts': [dataclasses.asdict(entry) for entry in added
+                              if entry.name in families],
+                    'calibri': calibri,
+                    'carlito': carlito,
+                }, f, indent=2)
+            tmp.replace(font_cache)
+
     if calibri is not None:
-        LOGO_FONT = calibri
+        LOGO_FONT.set_family('Calibri')
         if carlito is None:
-            FONT = calibri
+            FONT.set_family('Calibri')
             print('WARNING: Using Calibri for all text. '
                   'Non-logo text may not appear correct.')
         else:
-            FONT = carlito
+            FONT.set_family('Carlito')
             print('Using Calibri for logo and Carlito for remaining text.')
     elif carlito is not None:
         print('WARNING: Using Carlito for all text. '
               'The logo may not appear correct.')
-        LOGO_FONT = carlito
-        FONT = carlito
+        LOGO_FONT.set_family('Carlito')
+        FONT.set_family('Carlito')
     else:
         sys.exit('Calibri or Carlito font must be installed.')
 
 
+def font_fingerprint(prop):
+    """
+    Return the path, size, and mtime of the font file that *prop* resolves to.
+
+    This identifies the font in cache keys, without reading the file.
+    """
+    font = matplotlib.font_manager.findfont(prop)
+    stat = os.stat(font)
+    return f'{font}:{stat.st_size}:{stat.st_mtime_ns}'
+
+
+@functools.cache
+def _prefetch_executor():
+    """Return the thread pool on which data is prefetched."""
+    return ThreadPoolExecutor(thread_name_prefix='prefetch')
+
+
+def prefetchable(func):
+    """
+    Allow the result of *func* to be prepared ahead of time, in the background.
+
+    ``func.prefetch(*args, **kwargs)`` starts the call on a thread pool, and the
+    next call of *func* with the same arguments waits for that result, instead
+    of computing it again. Sections use this (in their ``prefetch`` function)
+    to prepare slow data, like generated arrays or files read from disk, while
+    earlier slides are rendered.
+    """
+    futures = {}
+    lock = threading.Lock()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with lock:
+            future = futures.pop((args, tuple(sorted(kwargs.items()))), None)
+        if future is None:
+            return func(*args, **kwargs)
+        return future.result()
+
+    def prefetch(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        with lock:
+            if key not in futures:
+                futures[key] = _prefetch_executor().submit(func, *args, **kwargs)
+
+    wrapper.prefetch = prefetch
+    return wrapper
+
+
+#: Functions generating demo datasets, by name; see `dataset`.
+_DATASETS = {}
+#: The directory in which generated datasets are cached; see `use_dataset_cache`.
+_dataset_cache = None
+#: The directory in which built assets are cached; see `use_asset_cache`.
+_asset_cache = None
+
+
+def dataset(name):
+    """
+    Register a function generating a demo dataset under *name*.
+
+    The function is called as ``func(rng, **params)``, where *rng* is a seeded
+    `numpy.random.Generator`, and must return an array. It should not use any
+    other source of randomness, so that its output is the same on every build.
+    """
+    def decorator(func):
+        _DATASETS[name] = func
+        return func
+    return decorator
+
+
+def _cached_array(cache, name, key, build):
+    """
+    Return the path of an array cached as a ``.npy`` file in *cache*.
+
+    The file is named after *name* and the hash of *key*, which must be
+    JSON-serializable. If it does not exist, the array is created by calling
+    *build* with no arguments, and saved.
+    """
+    digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+    path = cache / f'{name}-{digest[:16]}.npy'
+    if not path.exists():
+        data = np.asarray(build())
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write under a unique name, as parallel builds (or a prefetch and a
+        # slide) may create the same array at once.
+        tmp = path.with_name(
+            f'{path.stem}.{os.getpid()}-{threading.get_ident()}.tmp')
+        with open(tmp, 'wb') as f:
+            np.save(f, data)
+        tmp.replace(path)
+    return path
+
+
+def use_dataset_cache(path):
+    """
+    Cache generated datasets as ``.npy`` files in the directory *path*.
+
+    If *path* is None, datasets are generated again each time.
+    """
+    global _dataset_cache
+    _dataset_cache = None if path is None else pathlib.Path(path)
+
+
+@prefetchable
+def get_dataset(name, seed=SEED, **params):
+    """
+    Return a registered demo dataset.
+
+    This may be prefetched, as ``get_dataset.prefetch(name, ...)``. If a cache
+    is in use, the dataset is only generated if it is not already cached for
+    the same generator source, seed, parameters, and NumPy version; otherwise
+    it is memory-mapped from the cache, read-only.
+
+    Parameters
+    ----------
+    name : str
+        The name under which the dataset was registered with `dataset`.
+    seed : int, default: `SEED`
+        The seed for the random number generator.
+    **params
+        Further arguments to the dataset function.
+
+    Returns
+    -------
+    np.ndarray
+    """
+    func = _DATASETS[name]
+    if _dataset_cache is None:
+        return func(np.random.default_rng(seed), **params)
+
+    key = {
+        'numpy': np.__version__,
+        'source': inspect.getsource(func),
+        'seed': seed,
+        'params': params,
+    }
+    path = _cached_array(_dataset_cache, name, key,
+                         lambda: func(np.random.default_rng(seed), **params))
+    return np.load(path, mmap_mode='r')
+
+
+def use_asset_cache(path):
+    """
+    Cache built assets as ``.npy`` files in the directory *path*.
+
+    If *path* is None, assets are built again each time.
+    """
+    global _asset_cache
+    _asset_cache = None if path is None else pathlib.Path(path)
+
+
+def get_asset(name, build, depends=None, **params):
+    """
+    Return an asset, such as the geometry of a logo, as an array.
+
+    If a cache is in use, the asset is only built if it is not already cached
+    for the same *build* source, parameters, dependencies, and Matplotlib
+    version, so that its inputs (e.g., fonts) need not be loaded at all. Assets are stored as
+    single ``.npy`` files, as reading ``.npz`` files would import `zipfile`,
+    which is slower than building small assets in the first place.
+
+    Parameters
+    ----------
+    name : str
+        The name of the asset, used for its cache file.
+    build : callable
+        Called as ``build(**params)``, and must return an array.
+    depends : optional
+        Any other data that the asset depends on, such as the
+        `font_fingerprint` of a font file, which is only used in the cache key.
+    **params
+        Arguments to *build*.
+
+    *depends* and *params* must be JSON-serializable.
+
+    Returns
+    -------
+    np.ndarray
+    """
+    if _asset_cache is None:
+        return np.asarray(build(**params))
+
+    key = {
+        'matplotlib': matplotlib.__version__,
+        'source': inspect.getsource(build),
+        'params': params,
+        'depends': depends,
+    }
+    return np.load(_cached_array(_asset_cache, name, key,
+                                 lambda: build(**params)))
+
+
+@contextlib.contextmanager
+def slide_geometry(figsize, dpi=None):
+    """
+    Create slides of a different size within the context.
+
+    Positions on slides are mostly in figure fractions, so they follow the
+    new size; text sizes do not, but headings and lists are shrunk if they
+    would not fit across the slide (see `fit_width`).
+
+    Parameters
+    ----------
+    figsize : (float, float)
+        The width and height of slides, in inches.
+    dpi : float, optional
+        The DPI of slides; if not given, it is not changed.
+    """
+    global FIGSIZE, DPI
+    old = FIGSIZE, DPI
+    FIGSIZE = tuple(figsize)
+    if dpi is not None:
+        DPI = dpi
+    try:
+        yield
+    finally:
+        FIGSIZE, DPI = old
+
+
 def new_slide(plain=False, **kwargs):
     """
     Create a new slide.
@@ -86,7 +412,7 @@ def new_slide(plain=False, **kwargs):
         Whether to leave out any slide decorations (e.g., logo).
     """
 
-    fig = plt.figure(figsize=FIGSIZE, dpi=DPI, **kwargs)
+    fig = matplotlib.figure.Figure(figsize=FIGSIZE, dpi=DPI, **kwargs)
     fig.mplslide_props = {'plain': plain}
     return fig
 
@@ -95,6 +421,8 @@ def slide_heading(fig, text):
     """
     Add a heading to a slide, using a common style.
 
+    The heading is shrunk if it would run into the corner logo.
+
     Parameters
     ----------
     fig : matplotlib.figure.Figure
@@ -103,7 +431,9 @@ def slide_heading(fig, text):
         The text to place in the heading.
     """
 
-    fig.text(0.05, 0.85, text, color='C0', fontproperties=FONT, fontsize=72)
+    right = 1 if fig.mplslide_props['plain'] else CORNER_LOGO_POSITION[0]
+    fit_width(fig.text(0.05, 0.85, text, color='C0', fontproperties=FONT,
+                       fontsize=72), right=right)
 
 
 def slide_subfig_heading(subfig, text):
@@ -144,10 +474,517 @@ def annotate_pr_author(fig, *authors, pr=None):
         t.set_url(f'https://github.com/matplotlib/matplotlib/pull/{pr}')
 
 
-def add_qrcode(fig, url, location):
+def bullet_level1(fig, y, text, **kwargs):
+    """
+    Create a level 1 list item.
+
+    Parameters
+    ----------
+    fig : matplotlib.figure.Figure
+        A slide figure.
+    y : float
+        The vertical position for the list item, in 0-1 figure space.
+    text : str
+        The text to place in the list item.
+    """
+    return fig.text(0.05, y, text,
+                    **{'fontproperties': FONT, 'fontsize': 48, 'alpha': 0.7,
+                       'verticalalignment': 'top', **kwargs})
+
+
+def bullet_level2(fig, y, text, **kwargs):
+    """
+    Create a level 2 list item.
+
+    This is roughly the same as level 1, but not bolded, and indented more.
+
+    Parameters
+    ----------
+    fig : matplotlib.figure.Figure
+        A slide figure.
+    y : float
+        The vertical position for the list item, in 0-1 figure space.
+    text : str
+        The text to place in the list item.
+    """
+    return fig.text(0.1, y, text,
+                    **{'fontproperties': FONT, 'fontsize': 48, 'fontweight': 'normal',
+                       'alpha': 0.7, 'verticalalignment': 'top', **kwargs})
+
+
+@functools.cache
+def _measure_renderer(dpi):
+    """Return a renderer with which to measure text at *dpi*."""
+    from matplotlib.backends.backend_agg import RendererAgg
+
+    return RendererAgg(1, 1, dpi)
+
+
+#: Sizes of measured text, keyed on the text and its font.
+_text_extents = {}
+
+
+def text_extent(text):
+    """
+    Return the size of a Text artist, in points.
+
+    Measurements are cached on the text and its font, so repeated strings
+    (including mathtext) are only laid out once, on any slide. Text is measured
+    at the DPI of its figure, as hinting changes its size at each DPI.
+
+    Parameters
+    ----------
+    text : matplotlib.text.Text
+        The text to measure; it must be added to a figure.
+
+    Returns
+    -------
+    width, height : float
+    """
+    dpi = text.get_figure(root=True).dpi
+    key = (text.get_text(), text.get_fontproperties().get_fontconfig_pattern(),
+           text.get_math_fontfamily(), text.get_linespacing(),
+           text.get_rotation(), text.get_usetex(), dpi)
+    extent = _text_extents.get(key)
+    if extent is None:
+        bbox = text.get_window_extent(renderer=_measure_renderer(dpi), dpi=dpi)
+        extent = _text_extents[key] = (bbox.width * 72 / dpi,
+                                       bbox.height * 72 / dpi)
+    return extent
+
+
+def fit_width(*texts, left=0, right=1):
+    """
+    Shrink the fonts of texts, if needed to fit between *left* and *right*.
+
+    The space for each text is found from its position and horizontal
+    alignment, e.g., centred text must fit on both sides of its position. All
+    texts are shrunk by the same factor, so that they keep their relative
+    sizes.
+
+    Parameters
+    ----------
+    *texts : matplotlib.text.Text
+        The texts, which must be added to a figure, in 0-1 figure space.
+    left, right : float, default: 0, 1
+        The horizontal limits, in 0-1 figure space.
+
+    Returns
+    -------
+    float
+        The factor by which the fonts were scaled.
+    """
+    def available(text):
+        x = text.get_position()[0]
+        space = {
+            'left': right - x,
+            'center': 2 * min(x - left, right - x),
+            'right': x - left,
+        }[text.get_horizontalalignment()]
+        return space * text.get_figure(root=True).get_figwidth() * 72
+
+    total = 1
+    # Hinted text widths change in steps with the font size, so texts are
+    # measured again, and shrunk at least a little more, until they fit.
+    for _ in range(10):
+        scale = min([available(text) / text_extent(text)[0] for text in texts],
+                    default=1)
+        if scale >= 1:
+            break
+        scale = min(scale, 0.99)
+        for text in texts:
+            text.set_fontsize(text.get_fontsize() * scale)
+        total *= scale
+    return total
+
+
+class Bullet:
+    """
+    An item in a list for `add_bullets`.
+
+    Parameters
+    ----------
+    text : str
+        The text of the item, including any bullet symbol.
+    *children : Bullet or Code
+        Items to nest below this one.
+    url : str, optional
+        A hyperlink for the text.
+    """
+
+    def __init__(self, text, *children, url=None):
+        self.text = text
+        self.children = children
+        self.url = url
+
+
+class Code(Bullet):
+    """
+    A block of code in a list for `add_bullets`.
+
+    Parameters
+    ----------
+    text : str
+        The code, which may span multiple lines.
+    url : str, optional
+        A hyperlink for the code.
+    """
+
+    def __init__(self, text, url=None):
+        super().__init__(text, url=url)
+
+
+def add_bullets(fig, items, y=0.8, gap=0.01):
+    """
+    Add a (nested) list to a slide, placing each item below the previous.
+
+    Each item is measured (see `text_extent`), so that no items overlap, no
+    matter how many lines they contain. If any item is too wide for the slide,
+    all items are shrunk by the same factor (see `fit_width`).
+
+    Parameters
+    ----------
+    fig : matplotlib.figure.Figure
+        A slide figure.
+    items : list of Bullet, Code, or str
+        The items of the list; a str is a shorthand for a `Bullet` without
+        children. Top-level items are created with `bullet_level1`, and all
+        nested items with `bullet_level2`, but indented further for each
+        level.
+    y : float, default: 0.8
+        The vertical position of the top of the list, in 0-1 figure space.
+    gap : float, default: 0.01
+        The vertical space between items, in 0-1 figure space.
+
+    Returns
+    -------
+    list of matplotlib.text.Text
+        The texts of all items, in order.
+    """
+    height = fig.get_figheight() * 72
+    texts = []
+
+    def add(items, level):
+        for item in items:
+            if isinstance(item, str):
+                item = Bullet(item)
+            kwargs = CODE if isinstance(item, Code) else {}
+            if level == 1:
+                text = bullet_level1(fig, y, item.text, **kwargs)
+            else:
+                text = bullet_level2(fig, y, item.text, **kwargs)
+                text.set_x(0.05 * level)
+            if item.url is not None:
+                text.set_url(item.url)
+            texts.append(text)
+            add(item.children, level + 1)
+
+    add(items, 1)
+    # Items are placed once the whole list is shrunk, as that changes heights.
+    fit_width(*texts, right=0.95)
+    for text in texts:
+        text.set_y(y)
+        y -= text_extent(text)[1] / height + gap
+    if y + gap < 0:
+        warnings.warn('List does not fit on the slide.')
+    return texts
+
+
+def axes_pixel_shape(ax):
+    """
+    Return the number of rows and columns of pixels an Axes covers on its slide.
+    """
+    fig = ax.get_figure(root=True)
+    bbox = ax.get_position().transformed(fig.transFigure)
+    return (math.ceil(bbox.height), math.ceil(bbox.width))
+
+
+#: Functions that combine blocks of data in `block_reduce`.
+_REDUCTIONS = {'mean': np.add, 'sum': np.add, 'min': np.minimum, 'max': np.maximum}
+
+
+def _block_starts(n, size):
+    """Return the start of each of *size* (nearly) equal blocks of *n* items."""
+    return np.unique(np.linspace(0, n, size, endpoint=False).astype(int))
+
+
+def block_reduce(data, shape, reduce='mean'):
+    """
+    Shrink the last two axes of *data* to at most *shape*, by combining blocks.
+
+    Blocks differ in size by at most one element, so that all data is used and
+    keeps its extent. Masked values are left out of each block, and blocks
+    with no unmasked values are masked. Integer data (e.g., RGB images) keeps
+    its type, with means rounded to the nearest integer.
+
+    Parameters
+    ----------
+    data : array-like
+        The data to shrink. Axes that already fit are left as-is.
+    shape : (int, int)
+        The maximum number of rows and columns.
+    reduce : {'mean', 'sum', 'min', 'max'}, default: 'mean'
+        How to combine each block. Use 'mean' for continuous data; 'min' or
+        'max' keep extremes (or categories) that would otherwise be averaged
+        away.
+    """
+    data = np.asanyarray(data)
+    axes = [(axis, size) for axis, size in zip((-2, -1), shape)
+            if data.shape[axis] > size]
+    if not axes:
+        return data
+    ufunc = _REDUCTIONS[reduce]
+    dtype = data.dtype
+    masked = np.ma.isMaskedArray(data)
+    if masked:
+        valid = (~np.ma.getmaskarray(data)).astype(np.intp)
+        data = data.filled({'min': np.ma.minimum_fill_value(data),
+                            'max': np.ma.maximum_fill_value(data)}.get(reduce, 0))
+    # Sum integers in a wider type, so that they cannot overflow.
+    wide = np.int64 if ufunc is np.add and dtype.kind in 'biu' else None
+    counts = 1
+    for axis, size in axes:
+        n = data.shape[axis]
+        starts = _block_starts(n, size)
+        data = ufunc.reduceat(data, starts, axis=axis, dtype=wide)
+        if masked:
+            valid = np.add.reduceat(valid, starts, axis=axis)
+        counts = counts * np.diff(starts, append=n).reshape(
+            (-1,) + (1,) * (-axis - 1))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if reduce == 'mean':
+            data = data / (valid if masked else counts)
+            if dtype.kind in 'biu':
+                data = np.rint(data).astype(dtype)
+    if masked:
+        data = np.ma.masked_array(data, mask=valid == 0)
+    return data
+
+
+def add_image(ax, data, reduce='mean', multivariate=False, **kwargs):
+    """
+    Show an image on an Axes, with no more pixels than the Axes covers.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+        The Axes on which to show the image; it should already be positioned.
+    data : array-like or sequence of 2D array-like
+        The image, as for `~matplotlib.axes.Axes.imshow`.
+    reduce : {'mean', 'sum', 'min', 'max'}, default: 'mean'
+        How to combine pixels; see `block_reduce`.
+    multivariate : bool, default: False
+        Whether *data* is a sequence of 2D arrays, one for each variate of a
+        multivariate colormap, which are each reduced in the same way.
+    **kwargs
+        Passed to `~matplotlib.axes.Axes.imshow`. The extent defaults to that of
+        the full-size image, so that data coordinates are not changed.
+    """
+    budget = axes_pixel_shape(ax)
+    if multivariate:
+        height, width = np.shape(data[0])
+        data = tuple(block_reduce(part, budget, reduce) for part in data)
+    else:
+        data = np.asanyarray(data)
+        height, width = data.shape[:2]
+        # RGB(A) images have colour as the last axis, so reduce the first two.
+        if data.ndim == 3:
+            data = np.moveaxis(block_reduce(np.moveaxis(data, -1, 0), budget,
+                                            reduce), 0, -1)
+        else:
+            data = block_reduce(data, budget, reduce)
+    if kwargs.get('origin', matplotlib.rcParams['image.origin']) == 'upper':
+        kwargs.setdefault('extent', (-0.5, width - 0.5, height - 0.5, -0.5))
+    else:
+        kwargs.setdefault('extent', (-0.5, width - 0.5, -0.5, height - 0.5))
+    return ax.imshow(data, **kwargs)
+
+
+def _reduce_coords(coords, n, size):
+    """Reduce 1D mesh coordinates along with *n* cells shrunk to *size*."""
+    coords = np.asarray(coords)
+    if n <= size:
+        return coords
+    starts = _block_starts(n, size)
+    if len(coords) == n + 1:  # Cell edges.
+        return coords[np.append(starts, n)]
+    return np.add.reduceat(coords, starts) / np.diff(starts, append=n)  # Centres.
+
+
+def add_mesh(ax, x, y, data, reduce='mean', multivariate=False, **kwargs):
+    """
+    Draw a pseudocolor mesh on an Axes, with no more cells than pixels it covers.
+
+    Meshes that are still too large to draw as vectors are rasterized when
+    saved, by `rasterize_dense`.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+        The Axes on which to draw the mesh; it should already be positioned.
+    x, y : 1D array-like
+        The cell centres or edges, as for `~matplotlib.axes.Axes.pcolormesh`.
+    data : 2D array-like or sequence of 2D array-like
+        The values of the cells.
+    reduce : {'mean', 'sum', 'min', 'max'}, default: 'mean'
+        How to combine cells; see `block_reduce`.
+    multivariate : bool, default: False
+        Whether *data* is a sequence of 2D arrays, one for each variate of a
+        multivariate colormap, which are each reduced in the same way.
+    **kwargs
+        Passed to `~matplotlib.axes.Axes.pcolormesh`.
+    """
+    budget = axes_pixel_shape(ax)
+    if multivariate:
+        rows, cols = np.shape(data[0])
+        data = tuple(block_reduce(part, budget, reduce) for part in data)
+    else:
+        data = np.asanyarray(data)
+        rows, cols = data.shape
+        data = block_reduce(data, budget, reduce)
+    x = _reduce_coords(x, cols, budget[1])
+    y = _reduce_coords(y, rows, budget[0])
+    return ax.pcolormesh(x, y, data, **kwargs)
+
+
+def _hatch_cost(artist, paths, transform):
+    """Estimate the vertices drawn to hatch *paths*; hatches repeat every inch."""
+    hatch = artist.get_hatch()
+    if not hatch:
+        return 0
+    area = 0
+    for path in paths:
+        extents = path.get_extents(transform)
+        area += extents.width * extents.height
+    return len(Path.hatch(hatch).vertices) * area / artist.figure.dpi**2
+
+
+def vector_cost(artist):
+    """
+    Estimate the cost of drawing *artist* as vectors, in path vertices.
+
+    This counts the vertices of its paths, the cells of a mesh, or its markers,
+    and the hatching over its area. Other artists, such as text and images,
+    cost nothing.
+    """
+    if isinstance(artist, QuadMesh):
+        rows, cols = artist.get_coordinates().shape[:2]
+        return 4 * (rows - 1) * (cols - 1)
+    if isinstance(artist, Collection):
+        paths = artist.get_paths()
+        if not paths:
+            return 0
+        # Paths are drawn at each offset, cycling through the shorter list.
+        offsets = len(artist.get_offsets())
+        vertices = sum(len(path.vertices) for path in paths)
+        if offsets > len(paths):
+            return vertices * offsets / len(paths)
+        return vertices + _hatch_cost(artist, paths, artist.get_transform())
+    if isinstance(artist, Line2D):
+        points = len(artist.get_xydata())
+        marker = len(MarkerStyle(artist.get_marker()).get_path().vertices)
+        line = artist.get_linestyle() not in ('None', '')
+        return points * (line + marker)
+    if isinstance(artist, Patch):
+        path = artist.get_path()
+        return len(path.vertices) + _hatch_cost(artist, [path],
+                                                artist.get_transform())
+    return 0
+
+
+def rasterize_dense(fig, limit=None):
+    """
+    Rasterize artists of *fig* that would be slow to display as vectors.
+
+    Artists whose `vector_cost` is above *limit* are drawn as images at the
+    resolution of the figure in vector output, while text stays as vectors, as
+    do figures drawn by a `.SharedFigureArtist`, such as the corner logo.
+
+    Parameters
+    ----------
+    fig : matplotlib.figure.Figure
+        The slide, which should be complete.
+    limit : int, default: `VECTOR_COST_LIMIT`
+        The largest cost to keep as vectors; if 0, nothing is rasterized.
+
+    Returns
+    -------
+    list of (str, float)
+        A description and the cost of each newly rasterized artist.
+    """
+    if limit is None:
+        limit = VECTOR_COST_LIMIT
+    rasterized = []
+    if not limit:
+        return rasterized
+    for artist in fig.findobj():
+        if artist.get_rasterized():
+            continue
+        cost = vector_cost(artist)
+        if cost > limit:
+            artist.set_rasterized(True)
+            name = type(artist).__name__
+            label = artist.get_label()
+            if label and not label.startswith('_'):
+                name += f' {label!r}'
+            if artist.axes is not None and artist.axes.get_title():
+                name += f' in {artist.axes.get_title()!r}'
+            rasterized.append((name, cost))
+    return rasterized
+
+
+@prefetchable
+@functools.lru_cache
+def _qrcode_path(url, error):
+    """
+    Return the dark modules of a QR code as a single path.
+
+    Horizontal runs of dark modules are merged into one rectangle each. The
+    path is in module coordinates, with the origin at the centre of the
+    top-left module (as with `~.Axes.imshow`), and includes the quiet zone.
+
+    Returns
+    -------
+    path : matplotlib.path.Path
+    size : int
+        The number of modules along each side, including the quiet zone.
+    """
+    import segno
+
+    qrcode = segno.make(url, error=error)
+    modules = np.array(list(qrcode.matrix_iter(border=4)), dtype=bool)
+    edges = np.diff(np.pad(modules, ((0, 0), (1, 1))).astype(np.int8), axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    _, stops = np.nonzero(edges == -1)
+
+    left = starts - 0.5
+    right = stops - 0.5
+    top = rows - 0.5
+    bottom = rows + 0.5
+    vertices = np.stack([
+        np.column_stack([left, top]),
+        np.column_stack([right, top]),
+        np.column_stack([right, bottom]),
+        np.column_stack([left, bottom]),
+        np.column_stack([left, top]),
+    ], axis=1).reshape(-1, 2)
+    codes = np.tile([Path.MOVETO, Path.LINETO, Path.LINETO, Path.LINETO,
+                     Path.CLOSEPOLY], len(rows))
+    return Path(vertices, codes, readonly=True), modules.shape[0]
+
+
+def prefetch_qrcode(url, error=None):
+    """Start encoding a QR code for `add_qrcode`, in the background."""
+    _qrcode_path.prefetch(url, error)
+
+
+def add_qrcode(fig, url, location, color=MPL_BLUE, error=None):
     """
     Add a QR code on a figure.
 
+    The QR code is drawn as vector shapes, so that it remains sharp at any
+    size, and is only encoded once for each URL.
+
     Parameters
     ----------
     fig : matplotlib.figure.Figure
@@ -156,12 +993,16 @@ def add_qrcode(fig, url, location):
         THe URL to link with the QR code.
     location : tuple of int
         A location accepted by `matplotlib.figure.Figure.add_axes` on which to place
-        the QR image.
+        the QR code.
+    color : color, default: `MPL_BLUE`
+        The color of the dark modules of the QR code.
+    error : {'L', 'M', 'Q', 'H'}, optional
+        The error correction level; if not given, the highest one that fits
+        in the smallest QR code for *url* is used.
     """
-    qrcode = segno.make(url)
-    out = io.BytesIO()
-    qrcode.save(out, kind='png', compresslevel=0, dark=MPL_BLUE)
-    out.seek(0)
-    img = Image.open(out).convert('RGB')
+    path, size = _qrcode_path(url, error)
     ax = fig.add_axes(location, frameon=False, xticks=[], yticks=[])
-    ax.imshow(img)
+    ax.add_patch(Rectangle((-0.5, -0.5), size, size, facecolor='white', lw=0))
+    ax.add_patch(PathPatch(path, facecolor=color, lw=0))
+    ax.set(xlim=(-0.5, size - 0.5), ylim=(size - 0.5, -0.5), aspect='equal')
+    return ax
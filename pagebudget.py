@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+
+"""
+Check each page of the presentation against its size and complexity budget.
+
+Usage: ./pagebudget.py [--pdf slides.pdf] [--budgets budgets.json]
+                       [--update] [--only SECTION,...]
+                       /path/to/matplotlib/checkout
+
+The PDF is read to find, for each page, the bytes of all streams needed to
+show it, the number of content stream operators, the number of images and
+their pixels, and the bytes of the fonts it uses. The deck is also built again
+to time drawing each slide with Agg. These are compared against the budgets,
+and the script fails if any slide is over.
+
+Budgets are read from a JSON file, with a ``default`` budget for all slides,
+and ``slides`` overriding it for any slide, named as ``section:index`` (as in
+the profiling report).
+"""
+
+import argparse
+import json
+import math
+import pathlib
+import sys
+import time
+
+
+#: The measurements of each page, and their labels and units.
+METRICS = {
+    'bytes': ('Bytes', 'B'),
+    'operators': ('Operators', ''),
+    'images': ('Images', ''),
+    'image_pixels': ('Image pixels', 'px'),
+    'font_bytes': ('Font bytes', 'B'),
+    'render_time': ('Agg render', 's'),
+}
+
+
+def _stream_bytes(stream):
+    """Return the stored (i.e., compressed) size of a PDF stream."""
+    # pypdf drops /Length when reading a stream, but keeps its encoded data.
+    return len(stream.get_object()._data)
+
+
+def _font_bytes(font):
+    """Return the size of the glyph data of a PDF font."""
+    if '/CharProcs' in font:  # Type 3, with a stream per glyph.
+        return sum(_stream_bytes(proc) for proc in font['/CharProcs'].values())
+    if '/DescendantFonts' in font:  # Type 0, with the glyphs in its descendant.
+        font = font['/DescendantFonts'][0].get_object()
+    descriptor = font.get('/FontDescriptor')
+    if descriptor is None:  # One of the standard 14 fonts.
+        return 0
+    descriptor = descriptor.get_object()
+    return sum(_stream_bytes(descriptor[key])
+               for key in ('/FontFile', '/FontFile2', '/FontFile3')
+               if key in descriptor)
+
+
+class _PageMeasurer:
+    """
+    Measure the pages of a PDF, following only the resources they use.
+
+    Matplotlib writes a single resource dictionary for the whole document, so
+    the fonts and XObjects that a page needs are found from its operators.
+    """
+
+    def __init__(self, reader):
+        from pypdf.generic import ContentStream
+
+        self._reader = reader
+        self._content_stream = ContentStream
+        self._operations = {}
+
+    def _parse(self, stream):
+        key = getattr(stream.indirect_reference, 'idnum', None)
+        if key is None:
+            return self._content_stream(stream, self._reader).operations
+        if key not in self._operations:
+            self._operations[key] = self._content_stream(
+                stream, self._reader).operations
+        return self._operations[key]
+
+    def _visit(self, operations, resources, stats, seen):
+        # Each use of a form runs its operators again, but its data (and that
+        # of fonts and images) is only loaded once.
+        stats['operators'] += len(operations)
+        for operands, operator in operations:
+            if operator == b'Tf':
+                ref = resources['/Font'].raw_get(operands[0])
+                if ref.idnum not in seen:
+                    seen.add(ref.idnum)
+                    stats['font_bytes'] += _font_bytes(ref.get_object())
+            elif operator == b'Do':
+                ref = resources['/XObject'].raw_get(operands[0])
+                xobject = ref.get_object()
+                first = ref.idnum not in seen
+                seen.add(ref.idnum)
+                if xobject['/Subtype'] == '/Image':
+                    stats['images'] += 1
+                    stats['image_pixels'] += xobject['/Width'] * xobject['/Height']
+                    if first:
+                        stats['bytes'] += _stream_bytes(xobject)
+                        if '/SMask' in xobject:
+                            stats['bytes'] += _stream_bytes(xobject['/SMask'])
+                elif xobject['/Subtype'] == '/Form':
+                    if first:
+                        stats['bytes'] += _stream_bytes(xobject)
+                    self._visit(self._parse(xobject),
+                                xobject.get('/Resources', resources), stats, seen)
+
+    def measure(self, page):
+        """
+        Return the measurements of *page*, besides its render time.
+
+        Streams that are shared between pages count towards each page using
+        them, as a viewer must load them all to show it.
+        """
+        stats = {metric: 0 for metric in METRICS if metric != 'render_time'}
+        contents = page['/Contents'].get_object()
+        streams = contents if isinstance(contents, list) else [contents]
+        stats['bytes'] += sum(_stream_bytes(stream) for stream in streams)
+        self._visit(page.get_contents().operations, page['/Resources'], stats,
+                    set())
+        return stats
+
+
+def measure_pdf(filename):
+    """
+    Return the measurements of each page of a PDF file, besides render time.
+    """
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        sys.exit('Checking page budgets requires the pypdf library.')
+
+    reader = PdfReader(filename)
+    measurer = _PageMeasurer(reader)
+    return [measurer.measure(page) for page in reader.pages]
+
+
+def render_times(pages, rounds):
+    """
+    Return the name of each slide of *pages*, and its minimum Agg draw time.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    from make import build_section, release_figure
+
+    times = {}
+    for page, *args in pages:
+        for index, fig in enumerate(build_section(page, *args)):
+            canvas = FigureCanvasAgg(fig)
+            best = float('inf')
+            for _ in range(rounds):
+                start = time.perf_counter()
+                canvas.draw()
+                best = min(best, time.perf_counter() - start)
+            times[f'{page.__module__}:{index}'] = best
+            release_figure(fig)
+    return times
+
+
+def check(results, budgets):
+    """
+    Compare *results* against *budgets*.
+
+    Returns
+    -------
+    list of tuple
+        The slide name, metric, budget, and measurement, of each metric of each
+        slide that is over budget.
+    """
+    over = []
+    for name, stats in results.items():
+        budget = {**budgets.get('default', {}),
+                  **budgets.get('slides', {}).get(name, {})}
+        for metric, value in stats.items():
+            if metric in budget and value > budget[metric]:
+                over.append((name, metric, budget[metric], value))
+    return over
+
+
+def _format(metric, value):
+    unit = METRICS[metric][1]
+    if unit == 's':
+        return f'{value * 1000:.0f} ms'
+    if unit == 'B':
+        return f'{value / 2**10:,.1f} KiB'
+    return f'{value:,}{" " + unit if unit else ""}'
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Check each page of the presentation against its budget.')
+    parser.add_argument('mpl_path', nargs='?',
+                        help='Path to the Matplotlib checkout the PDF was built '
+                             'with, for the timeline.')
+    parser.add_argument('--pdf', default='slides.pdf',
+                        help='The PDF to check (default: %(default)s).')
+    parser.add_argument('--budgets', type=pathlib.Path, default='budgets.json',
+                        help='The JSON file of budgets (default: %(default)s).')
+    parser.add_argument('--only', type=lambda value: value.split(','),
+                        metavar='SECTION,...',
+                        help='The sections the PDF was built with, if not all.')
+    parser.add_argument('--timeline-years', type=int, default=5, metavar='YEARS',
+                        help='The number of years the PDF timeline was built '
+                             'with (default: %(default)s).')
+    parser.add_argument('--cache-dir', default='.slidecache',
+                        help='Directory of the font, tag, and dataset caches.')
+    parser.add_argument('--rounds', type=int, default=3,
+                        help='Number of times to draw each slide with Agg.')
+    parser.add_argument('--update', action='store_true',
+                        help='Set the budget of each slide that is over the '
+                             'default to its measurements, plus the margin.')
+    parser.add_argument('--margin', type=float, default=0.2,
+                        help='Fraction of headroom to allow when updating '
+                             'budgets (default: %(default)s).')
+    args = parser.parse_args()
+
+    import make
+    from mplslide import check_requirements, use_asset_cache, use_dataset_cache
+
+    if args.mpl_path is None and any(
+            'mpl_path' in make.SECTIONS[name]
+            for name in (make.SECTIONS if args.only is None else args.only)):
+        parser.error('the Matplotlib path is required to build the timeline')
+
+    check_requirements(pathlib.Path(args.cache_dir, 'fonts.json'))
+    use_dataset_cache(pathlib.Path(args.cache_dir, 'datasets'))
+    use_asset_cache(pathlib.Path(args.cache_dir, 'assets'))
+
+    pages = measure_pdf(args.pdf)
+    times = render_times(make.get_pages(args, args.only), args.rounds)
+    if len(pages) != len(times):
+        sys.exit(f'{args.pdf} has {len(pages)} pages, but the deck has '
+                 f'{len(times)} slides; build it again, or pass the same '
+                 f'--only.')
+    results = {name: {**stats, 'render_time': times[name]}
+               for name, stats in zip(times, pages)}
+
+    width = max(len('Slide'), *(len(name) for name in results))
+    print(f'{"Slide":<{width}}' +
+          ''.join(f'{label:>16}' for label, _ in METRICS.values()))
+    for name, stats in results.items():
+        print(f'{name:<{width}}' +
+              ''.join(f'{_format(metric, stats[metric]):>16}' for metric in METRICS))
+
+    budgets = json.loads(args.budgets.read_text())
+    if args.update:
+        slides = budgets['slides'] = {}
+        for name, metric, _, value in check(results, {'default': budgets['default']}):
+            value *= 1 + args.margin
+            slides.setdefault(name, {})[metric] = (
+                round(value, 3) if METRICS[metric][1] == 's' else math.ceil(value))
+        args.budgets.write_text(json.dumps(budgets, indent=2) + '\n')
+        print(f'\nUpdated {args.budgets}.')
+        return
+
+    over = check(results, budgets)
+    if over:
+        print('\nOver budget:')
+        for name, metric, budget, value in over:
+            growth = f' ({value / budget - 1:+.0%})' if budget else ''
+            print(f'  {name} [{METRICS[metric][0]}]: {_format(metric, budget)} -> '
+                  f'{_format(metric, value)}{growth}')
+        sys.exit(1)
+    print('\nAll slides are within budget.')
+
+
+if __name__ == '__main__':
+    main()
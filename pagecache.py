@@ -0,0 +1,152 @@
+"""
+An on-disk cache of rendered slide pages.
+
+Each section of the presentation is stored as single-page PDF fragments (and
+any slides exported to other formats), keyed on everything that may change its
+output, so that unchanged sections can be spliced into the final PDF without
+running their slide functions again.
+"""
+
+import hashlib
+import inspect
+import json
+import pathlib
+import shutil
+
+import numpy as np
+import matplotlib
+import matplotlib.font_manager
+
+import mplslide
+
+
+class PageCache:
+    """
+    A size-limited cache of rendered sections.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        The directory in which to store cache entries.
+    max_size : int
+        The maximum size of the cache, in bytes. The least recently used
+        entries are removed when it is exceeded.
+    salt : str, optional
+        Any further data to include in every key, e.g., the source of the code
+        that decorates each slide.
+    """
+
+    def __init__(self, path, max_size, salt=''):
+        self.path = pathlib.Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.salt = salt
+        self.hits = 0
+        self.misses = 0
+        self._common = None
+
+    def _common_key(self):
+        """Return the key data shared by all sections."""
+        if self._common is None:
+            fonts = [mplslide.font_fingerprint(prop) for prop in [
+                mplslide.FONT, mplslide.LOGO_FONT,
+                matplotlib.font_manager.FontProperties(family='monospace')]]
+            # Sections draw data generated with NumPy, e.g., datasets.
+            self._common = '\n'.join([
+                np.__version__,
+                matplotlib.__version__,
+                repr(mplslide.FIGSIZE),
+                repr(mplslide.DPI),
+                repr(mplslide.VECTOR_COST_LIMIT),
+                mplslide.FONT.get_fontconfig_pattern(),
+                mplslide.LOGO_FONT.get_fontconfig_pattern(),
+                *fonts,
+                inspect.getsource(mplslide),
+                self.salt,
+            ])
+        return self._common
+
+    def key(self, page, args):
+        """
+        Return the cache key for a section.
+
+        If the module of *page* defines a ``cache_key`` function, it is called
+        with *args*, and its (JSON-serializable) result is included, for any
+        state outside the source that the section depends on.
+
+        Parameters
+        ----------
+        page : callable
+            The function creating the slides of the section.
+        args : tuple
+            Any arguments that are passed to *page*.
+        """
+        h = hashlib.sha256()
+        h.update(self._common_key().encode())
+        module = inspect.getmodule(page)
+        h.update(inspect.getsource(module).encode())
+        h.update(f'{page.__module__}.{page.__qualname__}{args!r}'.encode())
+        cache_key = getattr(module, 'cache_key', None)
+        if cache_key is not None:
+            h.update(json.dumps(cache_key(*args), sort_keys=True).encode())
+        return h.hexdigest()
+
+    def get(self, key):
+        """
+        Return the cached fragments for *key*, or None if not cached.
+        """
+        entry = self.path / key
+        if not entry.is_dir():
+            self.misses += 1
+            return None
+        self.hits += 1
+        entry.touch()  # Mark as recently used.
+        return sorted(entry.iterdir())
+
+    def put(self, key, files):
+        """
+        Move rendered *files* into the cache under *key*.
+
+        The files keep their names, which must be unique.
+
+        Returns
+        -------
+        list of pathlib.Path
+            The new locations of the files.
+        """
+        staging = self.path / f'{key}.tmp'
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir()
+        for file in files:
+            shutil.move(file, staging / file.name)
+        entry = self.path / key
+        shutil.rmtree(entry, ignore_errors=True)
+        staging.rename(entry)
+        return sorted(entry.iterdir())
+
+    def _entries(self):
+        """Return the directories of all entries, skipping other caches."""
+        return [entry for entry in self.path.iterdir()
+                if entry.is_dir() and len(entry.name) == 64]
+
+    def size(self):
+        """Return the total size of the cache, in bytes."""
+        return sum(f.stat().st_size
+                   for entry in self._entries() for f in entry.iterdir())
+
+    def evict(self):
+        """
+        Remove the least recently used entries until within the size limit.
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        total = self.size()
+        for entry in entries:
+            if total <= self.max_size:
+                break
+            total -= sum(f.stat().st_size for f in entry.iterdir())
+            shutil.rmtree(entry)
+
+    def stats(self):
+        """Return a summary line of cache usage."""
+        return (f'Page cache: {self.hits} hits, {self.misses} misses, '
+                f'{self.size() / 2**20:.1f} of {self.max_size / 2**20:.0f} MiB used')
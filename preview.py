@@ -0,0 +1,236 @@
+"""
+A local HTTP preview of the slides, refreshed as their sources change.
+"""
+
+import hashlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import sys
+import threading
+
+
+#: The width of slides on the preview page, in pixels.
+PREVIEW_WIDTH = 1280
+
+
+class SourceWatcher:
+    """
+    Poll a set of modules for changes to their source files.
+
+    Parameters
+    ----------
+    names : list of str
+        The names of the modules to watch; they must be importable.
+    """
+
+    def __init__(self, names):
+        self._paths = {}
+        for name in names:
+            module = sys.modules.get(name) or __import__(name)
+            self._paths[name] = module.__file__
+        self._mtimes = self._stat()
+
+    def _stat(self):
+        mtimes = {}
+        for name, path in self._paths.items():
+            try:
+                mtimes[name] = os.stat(path).st_mtime_ns
+            except OSError:  # E.g., while an editor is replacing the file.
+                mtimes[name] = None
+        return mtimes
+
+    def poll(self):
+        """Return the names of modules whose source changed since last polled."""
+        mtimes = self._stat()
+        changed = [name for name, mtime in mtimes.items()
+                   if mtime is not None and mtime != self._mtimes[name]]
+        for name in changed:
+            self._mtimes[name] = mtimes[name]
+        return changed
+
+
+class PreviewServer:
+    """
+    Serve rendered slides over HTTP, and notify browsers when they change.
+
+    The page at ``/`` shows all slides, and listens for server-sent events at
+    ``/events`` to reload only those slides that have changed.
+
+    Parameters
+    ----------
+    port : int
+        The port on which to listen, on localhost only.
+    fmt : {'png', 'svg'}
+        The format of the rendered slides.
+    """
+
+    def __init__(self, port, fmt):
+        self.fmt = fmt
+        self._sections = {}
+        self._order = []
+        self._error = None
+        self._generation = 0
+        self._changed = threading.Condition()
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', port), self._make_handler())
+        self._httpd.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}/'
+
+    def start(self):
+        """Start serving in a background thread."""
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        """Stop serving."""
+        with self._changed:
+            self._generation = -1
+            self._changed.notify_all()
+        self._httpd.shutdown()
+
+    def set_order(self, names):
+        """Set the order in which sections are shown."""
+        with self._changed:
+            self._order = list(names)
+
+    def publish(self, name, slides):
+        """
+        Replace the rendered slides of section *name*, and notify browsers.
+
+        Parameters
+        ----------
+        name : str
+            The name of the section.
+        slides : list of bytes
+            The rendered slides, in *fmt*.
+        """
+        with self._changed:
+            self._sections[name] = [
+                (data, hashlib.sha256(data).hexdigest()[:16]) for data in slides]
+            self._error = None
+            self._generation += 1
+            self._changed.notify_all()
+
+    def publish_error(self, message):
+        """Show an error (e.g., from a broken slide) on the page."""
+        with self._changed:
+            self._error = message
+            self._generation += 1
+            self._changed.notify_all()
+
+    def _slides(self):
+        return [slide for name in self._order for slide in self._sections.get(name, [])]
+
+    def _state(self):
+        with self._changed:
+            return json.dumps({
+                'slides': [f'/slide/{i}.{self.fmt}?v={digest}'
+                           for i, (_, digest) in enumerate(self._slides())],
+                'error': self._error,
+            })
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass  # Keep the console for build output.
+
+            def _send(self, content_type, body, cache=False):
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Cache-Control',
+                                 'max-age=31536000, immutable' if cache else 'no-cache')
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                path = self.path.split('?', 1)[0]
+                if path == '/':
+                    self._send('text/html; charset=utf-8', _PAGE.encode())
+                elif path == '/events':
+                    self._events()
+                elif path.startswith('/slide/'):
+                    index, _, fmt = path.removeprefix('/slide/').partition('.')
+                    with server._changed:
+                        slides = server._slides()
+                    if fmt != server.fmt or not index.isdigit() or \
+                            int(index) >= len(slides):
+                        self.send_error(404)
+                        return
+                    content_type = {'png': 'image/png', 'svg': 'image/svg+xml'}[fmt]
+                    # URLs include the digest, so may be cached forever.
+                    self._send(content_type, slides[int(index)][0], cache=True)
+                else:
+                    self.send_error(404)
+
+            def _events(self):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Cache-Control', 'no-cache')
+                self.end_headers()
+                generation = None
+                try:
+                    while True:
+                        with server._changed:
+                            server._changed.wait_for(
+                                lambda: server._generation != generation, timeout=15)
+                            if server._generation == -1:
+                                return
+                            changed = server._generation != generation
+                            generation = server._generation
+                        # Send a comment as a keep-alive if nothing changed.
+                        message = (f'data: {server._state()}\n\n' if changed
+                                   else ': keep-alive\n\n')
+                        self.wfile.write(message.encode())
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+        return Handler
+
+
+_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Slide preview</title>
+<style>
+body { margin: 0; background: #333; font-family: sans-serif; }
+img { display: block; width: 100%; max-width: 1280px; margin: 1em auto;
+      background: white; }
+#error { white-space: pre-wrap; background: #fdd; color: #600; margin: 0;
+         padding: 1em; }
+#error:empty { display: none; }
+</style>
+</head>
+<body>
+<pre id="error"></pre>
+<div id="slides"></div>
+<script>
+const container = document.getElementById('slides');
+const events = new EventSource('/events');
+events.onmessage = (event) => {
+  const state = JSON.parse(event.data);
+  document.getElementById('error').textContent = state.error || '';
+  // Only replace slides whose URL (and thus content) has changed.
+  state.slides.forEach((src, i) => {
+    let img = container.children[i];
+    if (!img) {
+      img = document.createElement('img');
+      container.append(img);
+    }
+    if (img.getAttribute('src') !== src) img.setAttribute('src', src);
+  });
+  while (container.children.length > state.slides.length) {
+    container.lastElementChild.remove();
+  }
+};
+</script>
+</body>
+</html>
+"""
@@ -0,0 +1,176 @@
+"""
+PDF output tuned for slides.
+
+These extend Matplotlib's PDF backend to share resources between all pages of
+the presentation, instead of writing them again for each page.
+"""
+
+import hashlib
+
+import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.backends.backend_mixed import MixedModeRenderer
+from matplotlib.backends.backend_pdf import (
+    GraphicsContextPdf, Name, Op, PdfFile, PdfPages, RendererPdf)
+
+
+class SlidePdfFile(PdfFile):
+    """
+    A `PdfFile` that writes identical images and shared figures only once.
+
+    Images are hashed by content, and any image that was already drawn on any
+    page of the document reuses the same image XObject.
+
+    Figures drawn by a `SharedFigureArtist` are written as a form XObject the
+    first time they are used, and each page then only refers to that form.
+
+    Parameters
+    ----------
+    filename : str or path-like or file-like
+        Output target.
+    metadata : dict, optional
+        Information dictionary object.
+    dedupe_images : bool, default: True
+        Whether to share identical images.
+    """
+
+    def __init__(self, filename, metadata=None, dedupe_images=True):
+        super().__init__(filename, metadata=metadata)
+        self.dedupe_images = dedupe_images
+        self._image_digests = {}
+        self._forms = {}
+
+    def imageObject(self, image):
+        # docstring inherited
+        if not self.dedupe_images:
+            return super().imageObject(image)
+        image = np.ascontiguousarray(image)
+        key = (image.shape, image.dtype.str, hashlib.sha256(image).digest())
+        name = self._image_digests.get(key)
+        if name is None:
+            name = self._image_digests[key] = super().imageObject(image)
+        return name
+
+    def formObject(self, figure):
+        """
+        Return the name of a form XObject that draws all of *figure*.
+
+        The form is only written when the file is finalized, so the figure
+        must not be changed until then.
+        """
+        entry = self._forms.get(id(figure))
+        if entry is None:
+            name = Name(f'Form{len(self._forms) + 1}')
+            ob = self.reserveObject(f'form {name}')
+            entry = self._forms[id(figure)] = (figure, name, ob)
+        return entry[1]
+
+    def writeForms(self):
+        """Draw the figures of all form XObjects into the file."""
+        for figure, name, ob in self._forms.values():
+            width, height = figure.get_size_inches()
+            self.beginStream(
+                ob.id, self.reserveObject('length of form stream'),
+                {'Type': Name('XObject'), 'Subtype': Name('Form'),
+                 'BBox': [0, 0, 72 * width, 72 * height],
+                 'Resources': self.resourceObject})
+            # Set up the same initial graphics state as for a page.
+            self.output(Name('DeviceRGB'), Op.setcolorspace_stroke)
+            self.output(Name('DeviceRGB'), Op.setcolorspace_nonstroke)
+            self.output(GraphicsContextPdf.joinstyles['round'], Op.setlinejoin)
+            dpi = figure.dpi
+            figure.dpi = 72  # As in FigureCanvasPdf.print_pdf.
+            try:
+                renderer = MixedModeRenderer(
+                    figure, width, height, dpi,
+                    RendererPdf(self, dpi, height, width))
+                figure.draw(renderer)
+                renderer.finalize()
+            finally:
+                figure.dpi = dpi
+            self.endStream()
+
+    def writeObject(self, object, contents):
+        # docstring inherited
+        if object is self.XObjectObject:
+            contents = {**contents,
+                        **{name: ob for _, name, ob in self._forms.values()}}
+        super().writeObject(object, contents)
+
+    def finalize(self):
+        # docstring inherited
+        # Forms may use fonts, images, etc., so must be drawn before those are
+        # written out.
+        self.endStream()
+        self.writeForms()
+        super().finalize()
+
+
+class SharedFigureArtist(Artist):
+    """
+    An artist that draws all of another figure on top of its own.
+
+    This allows content that is the same on many slides to be built only once.
+    When saved with `SlidePdfPages`, the content is also only written once to
+    the file, and shared by all pages.
+
+    Parameters
+    ----------
+    source : matplotlib.figure.Figure
+        The figure to draw. It should be the same size as the figure to which
+        this artist is added, and not have a background (e.g.,
+        ``frameon=False``).
+    """
+
+    def __init__(self, source, **kwargs):
+        super().__init__()
+        self.source = source
+        self.set_in_layout(False)
+        self._internal_update(kwargs)
+
+    def draw(self, renderer):
+        # docstring inherited
+        if not self.get_visible():
+            return
+        file = getattr(renderer, 'file', None)
+        if isinstance(file, SlidePdfFile):
+            name = file.formObject(self.source)
+            # The form starts from the current graphics state, so reset any
+            # clipping, colours, etc. left over from previous artists.
+            gc = renderer.new_gc()
+            renderer.check_gc(gc)
+            gc.restore()
+            file.output(Op.gsave, name, Op.use_xobject, Op.grestore)
+        else:
+            self.source.dpi = self.figure.dpi
+            self.source.draw(renderer)
+        self.stale = False
+
+
+class SlidePdfPages(PdfPages):
+    """
+    A multi-page PDF file, written with `SlidePdfFile`.
+
+    Identical images are written once, as are figures drawn by any
+    `SharedFigureArtist`.
+
+    Parameters
+    ----------
+    filename : str or path-like or file-like
+        Plots using `PdfPages.savefig` will be written to a file at this
+        location.
+    metadata : dict, optional
+        Information dictionary object.
+    dedupe_images : bool, default: True
+        Whether to write identical images only once in the whole document.
+    """
+
+    def __init__(self, filename, metadata=None, dedupe_images=True):
+        super().__init__(filename, metadata=metadata)
+        self._dedupe_images = dedupe_images
+
+    def _ensure_file(self):
+        if self._file is None:
+            self._file = SlidePdfFile(self._filename, metadata=self._metadata,
+                                      dedupe_images=self._dedupe_images)
+        return self._file
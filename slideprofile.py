@@ -0,0 +1,145 @@
+"""
+Profiling of the time and memory spent building each slide.
+"""
+
+import contextlib
+import cProfile
+import json
+import pstats
+import time
+import tracemalloc
+
+
+#: The phases of building a slide, in order.
+PHASES = ('construct', 'logo', 'save')
+
+
+class NullProfiler:
+    """
+    A profiler that records nothing, for use when not profiling.
+    """
+
+    def start_slide(self, section):
+        pass
+
+    def discard_slide(self):
+        pass
+
+    def phase(self, name):
+        return contextlib.nullcontext()
+
+
+class SlideProfiler:
+    """
+    Record the time and memory spent in each phase of building each slide.
+
+    Parameters
+    ----------
+    cprofile : bool, default: False
+        Whether to also run `cProfile` on each slide, and record its most
+        expensive functions.
+    top : int, default: 10
+        The number of functions to record from `cProfile`.
+    """
+
+    def __init__(self, cprofile=False, top=10):
+        self.cprofile = cprofile
+        self.top = top
+        self.slides = []
+        self._counts = {}
+        self._profile = None
+        tracemalloc.start()
+
+    def start_slide(self, section):
+        """
+        Start recording a new slide from the given *section*.
+        """
+        self._finish_slide()
+        index = self._counts.get(section, 0)
+        self._counts[section] = index + 1
+        self.slides.append({
+            'slide': f'{section}:{index}',
+            **{phase: 0.0 for phase in PHASES},
+            'peak_memory': 0,
+        })
+        if self.cprofile:
+            self._profile = cProfile.Profile()
+
+    def discard_slide(self):
+        """
+        Drop the slide that was last started, e.g., if the section had no more.
+        """
+        section, _, index = self.slides.pop()['slide'].rpartition(':')
+        self._counts[section] = int(index)
+        self._profile = None
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """
+        Record the time and peak memory used within the context as *name*.
+        """
+        record = self.slides[-1]
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        if self._profile is not None:
+            self._profile.enable()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record[name] += time.perf_counter() - start
+            if self._profile is not None:
+                self._profile.disable()
+            _, peak = tracemalloc.get_traced_memory()
+            record['peak_memory'] = max(record['peak_memory'], peak - baseline)
+
+    def _finish_slide(self):
+        """Store the `cProfile` statistics of the current slide, if any."""
+        if self._profile is None:
+            return
+        stats = pstats.Stats(self._profile)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE)
+        functions = []
+        for func in stats.fcn_list[:self.top]:
+            calls, _, tottime, cumtime, _ = stats.stats[func]
+            functions.append({
+                'function': pstats.func_std_string(func),
+                'calls': calls,
+                'tottime': tottime,
+                'cumtime': cumtime,
+            })
+        self.slides[-1]['functions'] = functions
+        self._profile = None
+
+    def report(self):
+        """
+        Return the recorded data for all slides.
+
+        Returns
+        -------
+        list of dict
+            One entry per slide, in build order, with the time in seconds of
+            each phase, the total, and the peak traced memory in bytes.
+        """
+        self._finish_slide()
+        for record in self.slides:
+            record['total'] = sum(record[phase] for phase in PHASES)
+        return self.slides
+
+    def write_json(self, filename):
+        """Write the report to *filename* as JSON."""
+        with open(filename, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def print_table(self):
+        """Print the report as a table, with the slowest slides first."""
+        slides = sorted(self.report(), key=lambda record: record['total'],
+                        reverse=True)
+        width = max([len('Slide'), *(len(record['slide']) for record in slides)])
+        header = ''.join(f'{name.capitalize():>11}' for name in (*PHASES, 'total'))
+        print(f'{"Slide":<{width}}{header}  Peak (MiB)')
+        for record in slides:
+            times = ''.join(f'{record[name]:10.3f}s'
+                            for name in (*PHASES, 'total'))
+            print(f'{record["slide"]:<{width}}{times}'
+                  f'  {record["peak_memory"] / 2**20:10.1f}')
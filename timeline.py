@@ -6,16 +6,109 @@ Matplotlib repository.
 """
 
 from datetime import datetime
-import subprocess
+import pathlib
+import re
 
 import numpy as np
-import matplotlib.pyplot as plt
+import matplotlib.artist as martist
+import matplotlib.colors as mcolors
 import matplotlib.dates as mdates
 
-from mplslide import new_slide, slide_heading
+from gittags import read_tags, tag_state
+from mplslide import new_slide, prefetchable, slide_heading
 
 
-def slides(mpl_path):
+#: A PEP 440 version, optionally prefixed by ``v`` as in release tags.
+VERSION_PATTERN = re.compile(r"""
+    v?
+    (?:(?P<epoch>[0-9]+)!)?
+    (?P<release>[0-9]+(?:\.[0-9]+)*)
+    (?P<pre>[-_.]?(?:a|b|c|rc|alpha|beta|pre|preview)[-_.]?[0-9]*)?
+    (?P<post>-[0-9]+|[-_.]?(?:post|rev|r)[-_.]?[0-9]*)?
+    (?P<dev>[-_.]?dev[-_.]?[0-9]*)?
+    (?:\+(?P<local>[a-z0-9]+(?:[-_.][a-z0-9]+)*))?
+""", re.VERBOSE | re.IGNORECASE)
+
+
+def parse_releases(tags):
+    """
+    Find the final releases among tags.
+
+    Parameters
+    ----------
+    tags : dict
+        Mapping of tag name to its date, as an ISO 8601 string.
+
+    Returns
+    -------
+    dates : np.ndarray of datetime64[D]
+    major, meso, micro : np.ndarray of int
+        The components of each release; missing components are 0.
+    labels : list of str
+        The version of each release, as written in the tag.
+
+    All are sorted by date, then version. Tags that are not PEP 440 versions,
+    and pre-, post-, development, and local releases are skipped.
+    """
+    dates = []
+    parts = []
+    labels = []
+    for tag_name, date in tags.items():
+        match = VERSION_PATTERN.fullmatch(tag_name)
+        if match is None or any(match[name]
+                                for name in ('pre', 'post', 'dev', 'local')):
+            continue
+        release = [int(part) for part in match['release'].split('.')]
+        dates.append(date)
+        parts.append((release + [0, 0, 0])[:3])
+        labels.append(match['release'])
+    dates = np.array(dates, dtype='datetime64[D]')
+    parts = np.array(parts, dtype=int).reshape((-1, 3))
+    order = np.lexsort((parts[:, 2], parts[:, 1], parts[:, 0], dates))
+    major, meso, micro = parts[order].T
+    return dates[order], major, meso, micro, [labels[i] for i in order]
+
+
+def release_levels(major, meso, micro):
+    """
+    Choose the height of the stem of each release.
+
+    Meso releases alternate between top and bottom, and stems are
+    progressively shortened for micro releases.
+    """
+    _, meso_index = np.unique(np.stack([major, meso]), axis=1, return_inverse=True)
+    heights = 1 + 0.8 * (5 - micro)
+    return np.where(meso_index.ravel() % 2 == 0, heights, -heights)
+
+
+@prefetchable
+def release_tags(mpl_path, cache_dir=None):
+    """
+    Return the release tags of a Matplotlib checkout and their dates.
+
+    If *cache_dir* is given, the index of tags is kept in it; see `read_tags`.
+    """
+    return read_tags(
+        mpl_path,
+        cache=None if cache_dir is None else pathlib.Path(cache_dir, 'tags.json'))
+
+
+def cache_key(mpl_path, cache_dir=None, years=5):
+    """
+    Return the state of the release tags, for the key of this section in the
+    page cache, with the same arguments as `slides`.
+    """
+    return tag_state(mpl_path)
+
+
+def prefetch(mpl_path, cache_dir=None, years=5):
+    """
+    Start reading the release tags, with the same arguments as `slides`.
+    """
+    release_tags.prefetch(mpl_path, cache_dir)
+
+
+def slides(mpl_path, cache_dir=None, years=5):
     """
     Create slide for release history.
 
@@ -23,71 +116,62 @@ def slides(mpl_path):
     ----------
     mpl_path : str or pathlib.Path
         Path to the Matplotlib checkout used to find release tags and dates.
+    cache_dir : str or pathlib.Path, optional
+        Directory in which to keep an index of the release tags, so that they
+        are only read from the checkout again when tags have changed.
+    years : int, default: 5
+        The number of years before this SciPy to show. Releases outside this
+        window are skipped entirely, not just hidden.
     """
     fig = new_slide()
 
     slide_heading(fig, 'Release History')
 
-    tags = subprocess.run(['git', 'tag', '-l',
-                           '--format=%(refname:strip=2) %(creatordate:short)'],
-                          cwd=mpl_path, capture_output=True, text=True)
-    dates = []
-    releases = []
-    for item in tags.stdout.splitlines():
-        tag_name, date = item.split(' ', 1)
-        if 'rc' not in tag_name and 'b' not in tag_name:
-            dates.append(datetime.fromisoformat(date))
-            releases.append(tag_name.lstrip('v'))
-    releases = [
-        tuple(release.split('.'))  # Split into components.
-        for release in releases
-    ]
-    dates, releases = zip(*sorted(zip(dates, releases)))  # Sort by increasing date.
-
-    def is_feature(release):
-        return release[-1] == '0'
-
-    # Choose some nice levels: alternate meso releases between top and bottom, and
-    # progressively shorten the stems for micro releases.
-    levels = []
-    major_meso_releases = sorted({release[:2] for release in releases})
-    for release in releases:
-        major_meso = release[:2]
-        micro = int(release[2])
-        h = 1 + 0.8 * (5 - micro)
-        level = h if major_meso_releases.index(major_meso) % 2 == 0 else -h
-        levels.append(level)
+    tags = release_tags(mpl_path, cache_dir)
+    dates, major, meso, micro, labels = parse_releases(tags)
+    is_feature = micro == 0
+    levels = release_levels(major, meso, micro)
+
+    this_scipy = datetime(2024, 7, 10)
+    last_scipy = datetime(2023, 7, 12)
+    start = this_scipy.replace(year=this_scipy.year - years)
+
+    # Only create artists for releases in view, plus a little on either side for
+    # markers that are cut off at the edges. Levels were chosen from all releases
+    # above, so they do not depend on the window.
+    pad = (this_scipy - start) / 100
+    visible = ((dates >= np.datetime64(start - pad, 'D')) &
+               (dates <= np.datetime64(this_scipy + pad, 'D')))
+    dates, levels, is_feature = dates[visible], levels[visible], is_feature[visible]
+    labels = [label for label, shown in zip(labels, visible) if shown]
 
     ax = fig.add_axes((0.05, 0.11, 0.9, 0.7))
 
     # The vertical stems.
-    ax.vlines(dates, 0, levels, linewidth=3,
-              color=[('tab:red', 1 if is_feature(release) else .5)
-                     for release in releases])
+    colors = np.tile(mcolors.to_rgba('tab:red'), (len(dates), 1))
+    colors[:, 3] = np.where(is_feature, 1, 0.5)
+    ax.vlines(dates, 0, levels, linewidth=3, color=colors)
     # The baseline.
     ax.axhline(0, color="black", linewidth=3)
     # The markers on the baseline.
-    meso_dates = [date for date, release in zip(dates, releases)
-                  if is_feature(release)]
-    micro_dates = [date for date, release in zip(dates, releases)
-                   if not is_feature(release)]
-    ax.plot(micro_dates, np.zeros_like(micro_dates), 'ko', mfc='white', markersize=10)
-    ax.plot(meso_dates, np.zeros_like(meso_dates), 'ko', mfc='tab:red', markersize=10)
+    micro_dates = dates[~is_feature]
+    meso_dates = dates[is_feature]
+    ax.plot(micro_dates, np.zeros(len(micro_dates)), 'ko', mfc='white', markersize=10)
+    ax.plot(meso_dates, np.zeros(len(meso_dates)), 'ko', mfc='tab:red', markersize=10)
 
     # Annotate the lines.
-    for date, level, release in zip(dates, levels, releases):
-        version_str = '.'.join(release)
+    for date, level, feature, version_str in zip(dates, levels, is_feature, labels):
         ax.annotate(version_str, xy=(date, level),
                     xytext=(-3, np.sign(level)*3), textcoords="offset points",
                     verticalalignment="bottom" if level > 0 else "top",
                     fontsize=24,
-                    weight='bold' if is_feature(release) else 'normal',
+                    weight='bold' if feature else 'normal',
                     bbox=dict(boxstyle='round', pad=0.1, lw=0, fc=(1, 1, 1, 0.7)))
 
     # Format xaxis with yearly intervals.
     ax.xaxis.set(major_locator=mdates.YearLocator(),
                  major_formatter=mdates.DateFormatter("%Y"))
-    plt.setp(ax.get_xticklabels(), fontsize=24)
+    martist.setp(ax.get_xticklabels(), fontsize=24)
 
     # Remove the y-axis and some spines.
     ax.yaxis.set_visible(False)
@@ -95,13 +179,10 @@ def slides(mpl_path):
 
     ax.margins(y=0.1)
 
-    this_scipy = datetime(2024, 7, 10)
-    last_scipy = datetime(2023, 7, 12)
-
     # Annotate range between last SciPy and this SciPy.
     ax.axvspan(last_scipy, this_scipy, alpha=0.5)
 
-    # Only plot the last 5 years before this SciPy.
-    ax.set_xlim(this_scipy.replace(year=this_scipy.year - 5), this_scipy)
+    # Only plot the chosen years before this SciPy.
+    ax.set_xlim(start, this_scipy)
 
     return fig
@@ -6,14 +6,26 @@ file is based on `examples/misc/logos2.py` in the Matplotlib repository.
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
+import matplotlib as mpl
 import matplotlib.cm as cm
+import matplotlib.font_manager
 from matplotlib.patches import Rectangle, PathPatch
+from matplotlib.path import Path
 from matplotlib.textpath import TextPath
 import matplotlib.transforms as mtrans
 
 
-from mplslide import MPL_BLUE, LOGO_FONT, FONT, new_slide
+from mplslide import (MPL_BLUE, LOGO_FONT, FONT, fit_width, font_fingerprint,
+                      get_asset, new_slide)
+
+
+#: The skew of the 'matplotlib' wordmark, in degrees.
+WORDMARK_SKEW = 4.25
+#: The position of the icon on the title slide, in figure coordinates, where
+#: it replaces the 'o' of the wordmark on a slide of `ICON_FIGSIZE`.
+ICON_POSITION = (0.535, 0.52, 0.17, 0.28)
+#: The size of slide, in inches, for which `ICON_POSITION` is set.
+ICON_FIGSIZE = (19.2, 10.8)
 
 
 def create_icon_axes(fig, ax_position, lw_bars, lw_grid, lw_border, rgrid):
@@ -41,7 +53,7 @@ def create_icon_axes(fig, ax_position, lw_bars, lw_grid, lw_border, rgrid):
     ax : matplotlib.axes.Axes
         The created Axes.
     """
-    with plt.rc_context({'axes.edgecolor': MPL_BLUE,
+    with mpl.rc_context({'axes.edgecolor': MPL_BLUE,
                          'axes.linewidth': lw_border}):
         ax = fig.add_axes(ax_position, projection='polar')
         ax.set_axisbelow(True)
@@ -71,21 +83,65 @@ def create_icon_axes(fig, ax_position, lw_bars, lw_grid, lw_border, rgrid):
         return ax
 
 
+def _build_wordmark(text, size, font):
+    """
+    Return the outline of *text* in the *font* file, as rows of (x, y, code).
+    """
+    prop = matplotlib.font_manager.FontProperties(fname=font)
+    path = TextPath((0, 0), text, size=size, prop=prop)
+    return np.column_stack([path.vertices, path.codes])
+
+
+def wordmark_path(size):
+    """
+    Return the path of the 'matplotlib' wordmark, with text of *size* points.
+
+    The path is built from the glyphs of `LOGO_FONT` once, and then read from
+    the asset cache for as long as the font file is unchanged. It is not yet
+    skewed; see `WORDMARK_SKEW`.
+    """
+    outline = get_asset('wordmark', _build_wordmark, text='matplotlib', size=size,
+                        font=matplotlib.font_manager.findfont(LOGO_FONT),
+                        depends=font_fingerprint(LOGO_FONT))
+    return Path(outline[:, :2], outline[:, 2].astype(Path.code_type),
+                readonly=True)
+
+
 def create_text_axes(fig, height_px):
-    """Create an axes in *fig* that contains 'matplotlib' as Text."""
+    """Create and return an axes in *fig* that contains 'matplotlib' as Text."""
     ax = fig.add_axes((0, 0.4, 1, 0.5))
     ax.set_aspect("equal")
     ax.set_axis_off()
 
-    path = TextPath((0, 0), "matplotlib", size=height_px * 0.8, prop=LOGO_FONT)
+    # The skew is applied as a transform, not to the path, so that the Axes
+    # limits are found from the curves of the glyphs as they were designed.
+    trans = mtrans.Affine2D().skew_deg(WORDMARK_SKEW, 0)
 
-    angle = 4.25  # degrees
-    trans = mtrans.Affine2D().skew_deg(angle, 0)
-
-    patch = PathPatch(path, transform=trans + ax.transData, color=MPL_BLUE,
-                      lw=0)
+    patch = PathPatch(wordmark_path(height_px * 0.8),
+                      transform=trans + ax.transData, color=MPL_BLUE, lw=0)
     ax.add_patch(patch)
     ax.autoscale()
+    return ax
+
+
+def icon_position(text_ax):
+    """
+    Return the position of the icon over the wordmark in *text_ax*.
+
+    The wordmark keeps its aspect, so it is scaled and moved on slides of
+    other sizes; the icon is placed where it would be on the wordmark on a
+    slide of `ICON_FIGSIZE`.
+    """
+    # Find the wordmark on such a slide, as in `~.Axes.apply_aspect`.
+    width, height = ICON_FIGSIZE
+    box = text_ax.get_position(original=True)
+    reference = box.shrunk_to_aspect(
+        text_ax.get_data_ratio(), box, height / width).anchored(
+            text_ax.get_anchor(), box)
+    icon = mtrans.Bbox.from_bounds(*ICON_POSITION).transformed(
+        mtrans.BboxTransformFrom(reference) +
+        mtrans.BboxTransformTo(text_ax.get_position()))
+    return icon.bounds
 
 
 def slides():
@@ -94,13 +150,13 @@ def slides():
     """
     fig = new_slide(plain=True)
 
-    create_text_axes(fig, 110)
-    ax_pos = (0.535, 0.52, 0.17, 0.28)
-    create_icon_axes(fig, ax_pos, 1.4, 1, 2, [1, 3, 5, 7])
+    text_ax = create_text_axes(fig, 110)
+    create_icon_axes(fig, icon_position(text_ax), 1.4, 1, 2, [1, 3, 5, 7])
 
-    fig.text(0.5, 0.3, 'SciPy 2024',
-             fontproperties=FONT, color='C0', fontsize=72)
-    fig.text(0.5, 0.2, '@matplotlib',
-             fontproperties=FONT, color='C0', fontsize=72)
+    fit_width(fig.text(0.5, 0.3, 'SciPy 2024',
+                       fontproperties=FONT, color='C0', fontsize=72),
+              fig.text(0.5, 0.2, '@matplotlib',
+                       fontproperties=FONT, color='C0', fontsize=72),
+              right=0.95)
 
     return fig